@@ -0,0 +1,389 @@
+"""
+Shared build helpers for the static prop generators (torch, tower, treasure, wall).
+
+Each generate_*.py script used to carry its own copy of clear_scene,
+make_material and the primitive/bevel/join helpers.  They now import them
+from here, so the primitive template cache is filled once per Blender
+session and every later generator run reuses it.
+
+generate_troll.py also copies its materials from _material_template, builds
+its parts from the unit templates here and bakes its bevels with
+_bevel_by_class.
+
+Import from a generator with:
+
+    _HERE = os.path.dirname(os.path.abspath(__file__))
+    if _HERE not in sys.path:
+        sys.path.insert(0, _HERE)
+    if "blender_build_utils" in sys.modules:
+        importlib.reload(sys.modules["blender_build_utils"])
+    from blender_build_utils import clear_scene, make_material, PrimitiveBatch
+"""
+
+import bpy
+import bmesh
+import math
+import numpy as np
+
+# ──────────────────────────────────────────────
+#  Utility helpers
+# ──────────────────────────────────────────────
+
+def clear_scene():
+    # Remove through bpy.data rather than select_all + delete operators,
+    # one batch_remove per pass.  Meshes/armatures only orphan once their
+    # objects are gone, and materials once their meshes are.
+    for block in bpy.data.actions:
+        block.use_fake_user = False
+    bpy.data.batch_remove(ids=list(bpy.data.objects) + list(bpy.data.actions))
+    bpy.data.batch_remove(ids=[b for b in (*bpy.data.meshes, *bpy.data.armatures)
+                               if b.users == 0])
+    # Cached materials may be among the orphans, or belong to a file that
+    # has since been closed; forget them every time
+    _MAT_CACHE.clear()
+    bpy.data.batch_remove(ids=[m for m in bpy.data.materials if m.users == 0])
+
+
+# Principled BSDF input indices by socket name, looked up once per session
+# instead of a name search on every material
+_BSDF_INPUTS = {}
+
+
+def _bsdf_input(bsdf, name):
+    idx = _BSDF_INPUTS.get(name)
+    if idx is None:
+        idx = bsdf.inputs.find(name)
+        if idx < 0:     # find() gives -1, which would index the last input
+            raise KeyError(f"Principled BSDF has no input {name!r}")
+        _BSDF_INPUTS[name] = idx
+    return bsdf.inputs[idx]
+
+
+def _material_template():
+    """Bare Principled BSDF material that make_material copies, so the
+    default node tree is only built once.  Looked up by name, so it
+    survives clear_scene freeing it between runs."""
+    tpl = bpy.data.materials.get("_MaterialTemplate")
+    if tpl is None:
+        tpl = bpy.data.materials.new("_MaterialTemplate")
+        tpl.use_nodes = True
+    return tpl
+
+
+# Materials by (color, emission, roughness, metallic), so identical
+# make_material calls share one datablock instead of each building a new
+# node tree.  Cleared by clear_scene; entries are datablock references, so
+# a hit is only trusted while it still lives in the open file.
+_MAT_CACHE = {}
+
+
+def _cached_material(key):
+    mat = _MAT_CACHE.get(key)
+    if mat is None:
+        return None
+    try:
+        alive = bpy.data.materials.get(mat.name) == mat
+    except ReferenceError:      # freed with a previous file
+        alive = False
+    if not alive:
+        del _MAT_CACHE[key]
+        return None
+    return mat
+
+
+def make_material(name, color, emission=0.0, roughness=0.9, metallic=0.0):
+    key = (tuple(color), float(emission), float(roughness), float(metallic))
+    mat = _cached_material(key)
+    if mat is not None:
+        return mat
+    mat = _material_template().copy()
+    mat.name = name
+    bsdf = mat.node_tree.nodes.get("Principled BSDF")
+    _bsdf_input(bsdf, "Base Color").default_value = color
+    _bsdf_input(bsdf, "Roughness").default_value = roughness
+    _bsdf_input(bsdf, "Metallic").default_value = metallic
+    if emission > 0:
+        _bsdf_input(bsdf, "Emission Color").default_value = color
+        _bsdf_input(bsdf, "Emission Strength").default_value = emission
+    _MAT_CACHE[key] = mat
+    return mat
+
+
+# ──────────────────────────────────────────────
+#  Primitive templates
+# ──────────────────────────────────────────────
+# Unit primitives (radius 0.5, depth 1) with the same vertex layout and
+# face winding as bpy.ops.mesh.primitive_*_add.  Parts are built straight
+# from these instead of going through the operators.
+
+def _unit_circles(sizes):
+    """{n: (n, 2) unit-circle xy} for each ring size, from one sin/cos call."""
+    sizes = tuple(sizes)
+    theta = np.concatenate([2.0 * np.pi * np.arange(n) / n for n in sizes])
+    xy = np.stack([-np.sin(theta), np.cos(theta)], axis=1)
+    return dict(zip(sizes, np.split(xy, np.cumsum(sizes)[:-1])))
+
+
+# Ring sizes the props actually use; anything else is added on first use
+_CIRCLES = _unit_circles((6, 7, 8, 10, 12))
+
+
+def _ring(n, radius, z):
+    """n ring vertices, first on +Y, counter-clockwise seen from +Z."""
+    xy = _CIRCLES.get(n)
+    if xy is None:
+        xy = _CIRCLES[n] = _unit_circles((n,))[n]
+    return np.column_stack([radius * xy, np.full(n, z)])
+
+
+def _unit_cube():
+    verts = np.array([( 1,  1,  1), ( 1,  1, -1), ( 1, -1,  1), ( 1, -1, -1),
+                      (-1,  1,  1), (-1,  1, -1), (-1, -1,  1), (-1, -1, -1)],
+                     dtype=np.float32) * 0.5
+    faces = [(0, 4, 6, 2), (3, 2, 6, 7), (7, 6, 4, 5),
+             (5, 1, 3, 7), (1, 0, 2, 3), (5, 4, 0, 1)]
+    return verts, faces
+
+
+def _unit_cylinder(n):
+    verts = np.concatenate([_ring(n, 0.5, -0.5), _ring(n, 0.5, 0.5)]).astype(np.float32)
+    faces = [(i, (i + 1) % n, n + (i + 1) % n, n + i) for i in range(n)]
+    faces.append(tuple(range(n, 2 * n)))        # top cap
+    faces.append(tuple(reversed(range(n))))     # bottom cap
+    return verts, faces
+
+
+def _unit_cone(n):
+    verts = np.concatenate([_ring(n, 0.5, -0.5), [(0.0, 0.0, 0.5)]]).astype(np.float32)
+    faces = [(i, (i + 1) % n, n) for i in range(n)]
+    faces.append(tuple(reversed(range(n))))     # base cap
+    return verts, faces
+
+
+def _unit_uv_sphere(segments, rings):
+    phi = np.pi * np.arange(1, rings) / rings
+    body = [_ring(segments, 0.5 * np.sin(p), 0.5 * np.cos(p)) for p in phi]
+    verts = np.concatenate(body + [[(0.0, 0.0, 0.5), (0.0, 0.0, -0.5)]]).astype(np.float32)
+    top, bottom = len(verts) - 2, len(verts) - 1
+    last = (rings - 2) * segments
+    faces = []
+    for i in range(segments):
+        j = (i + 1) % segments
+        faces.append((top, i, j))
+        for r in range(rings - 2):
+            a, b = r * segments, (r + 1) * segments
+            faces.append((b + i, b + j, a + j, a + i))
+        faces.append((bottom, last + j, last + i))
+    return verts, faces
+
+
+# Module-level so it outlives a single generator run: Blender keeps imported
+# modules in sys.modules for the whole session, so e.g. the tower reuses the
+# cube template the torch already built.  The generators reload this module,
+# so carry the old dict over; it holds plain numpy data, never datablocks.
+_PRIM_CACHE = globals().get("_PRIM_CACHE", {})
+
+
+def _template(builder, *args):
+    """Return the unit template for (builder, args), building it only once.
+    Faces are flattened to (loop vertex indices, loop totals) arrays.
+    Templates are shared by every part of that shape, so they're read-only."""
+    key = (builder.__name__,) + args
+    tmpl = _PRIM_CACHE.get(key)
+    if tmpl is None:
+        verts, faces = builder(*args)
+        loop_vidx = np.array([i for f in faces for i in f], dtype=np.int32)
+        loop_totals = np.array([len(f) for f in faces], dtype=np.int32)
+        for arr in (verts, loop_vidx, loop_totals):
+            arr.setflags(write=False)
+        tmpl = _PRIM_CACHE[key] = (verts, loop_vidx, loop_totals)
+    return tmpl
+
+
+def _transform_matrices(locations, scales, rotations):
+    """(K, 4, 4) stack of T @ R @ S matrices, one per row of the (K, 3)
+    inputs.  Rotations are XYZ Euler in radians (R = Rz @ Ry @ Rx)."""
+    locations = np.asarray(locations, dtype=np.float64).reshape(-1, 3)
+    scales = np.asarray(scales, dtype=np.float64).reshape(-1, 3)
+    rotations = np.asarray(rotations, dtype=np.float64).reshape(-1, 3)
+    cx, cy, cz = np.cos(rotations).T
+    sx, sy, sz = np.sin(rotations).T
+
+    mats = np.zeros((len(locations), 4, 4))
+    rot = mats[:, :3, :3]
+    rot[:, 0, 0] = cy * cz
+    rot[:, 0, 1] = sx * sy * cz - cx * sz
+    rot[:, 0, 2] = cx * sy * cz + sx * sz
+    rot[:, 1, 0] = cy * sz
+    rot[:, 1, 1] = sx * sy * sz + cx * cz
+    rot[:, 1, 2] = cx * sy * sz - sx * cz
+    rot[:, 2, 0] = -sy
+    rot[:, 2, 1] = sx * cy
+    rot[:, 2, 2] = cx * cy
+    rot *= scales[:, None, :]
+    mats[:, :3, 3] = locations
+    mats[:, 3, 3] = 1.0
+    return mats
+
+
+# ──────────────────────────────────────────────
+#  Primitive batch (all parts → one mesh)
+# ──────────────────────────────────────────────
+
+BEVEL_ANGLE = math.radians(60)
+
+
+def _bevel_by_class(mesh, widths, face_classes):
+    """Bevel the merged mesh the way the old per-part Bevel modifiers did
+    (1 segment, ANGLE limit 60°), in a single bmesh session.
+    face_classes[i] is 0 for unbevelled faces, else 1 + index into widths.
+    Faces carry the class as an attribute rather than relying on index
+    ranges, since every bevel pass renumbers the mesh."""
+    attr = mesh.attributes.new("bevel_class", 'INT', 'FACE')
+    attr.data.foreach_set("value", face_classes)
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    layer = bm.faces.layers.int["bevel_class"]
+    bevel = bmesh.ops.bevel
+    for cls, width in enumerate(widths, start=1):
+        edges = [e for e in bm.edges
+                 if e.is_manifold and e.link_faces[0][layer] == cls
+                 and e.calc_face_angle() > BEVEL_ANGLE]
+        bevel(bm, geom=edges, offset=width, offset_type='OFFSET',
+              segments=1, profile=0.5, affect='EDGES',
+              clamp_overlap=True, loop_slide=True, material=-1)
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.attributes.remove(mesh.attributes["bevel_class"])
+
+
+def commit_mesh(name, verts, loop_starts, loop_vidx, material_index,
+                materials):
+    """Create mesh `name` from flat arrays via vertices/loops/polygons.add +
+    foreach_set (never from_pydata, whose per-element Python conversion
+    dominates at these sizes).  verts is (N, 3) float32 and the index
+    arrays are int32, matching the RNA property types, so Blender copies
+    each buffer in bulk.  Only loop_start is written: loop_total is
+    read-only since Blender 3.6 and derived from the next polygon's start."""
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", verts.ravel())
+    mesh.loops.add(len(loop_vidx))
+    mesh.loops.foreach_set("vertex_index", loop_vidx)
+    mesh.polygons.add(len(loop_starts))
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    mesh.polygons.foreach_set("material_index", material_index)
+    for m in materials:
+        mesh.materials.append(m)
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+class PrimitiveBatch:
+    """Collects transformed primitives and writes them out as a single mesh,
+    replacing the old one-object-per-part + join workflow.
+
+    min_bevel_size: parts whose thinnest side is below this skip their
+    requested bevel (a chamfer that small never shows in game).  Off by
+    default so existing props keep every bevel."""
+
+    def __init__(self, min_bevel_size=0.0):
+        self.min_bevel_size = min_bevel_size
+        self.verts = []          # per-block template-space vertices (K copies)
+        self.matrices = []       # per-block (K, 4, 4) placements
+        self.vert_counts = []    # vertices per instance, one entry per matrix
+        self.loop_vidx = []      # per-block loop vertex indices, merged-mesh space
+        self.loop_totals = []    # per-block polygon sizes
+        self.mat_indices = []    # per-block face material indices
+        self.bevel_classes = []  # per-block face classes, 0 = no bevel
+        self.mat_ids = {}        # material -> slot in the merged mesh
+        self.bevel_ids = {}      # bevel width -> face class (1-based)
+        self._vert_count = 0
+
+    def add_instances(self, template, locations, scales, rotations, material, bevel=0.0):
+        """Add K copies of `template`, one per row of the (K, 3) placement
+        arrays — the transforms and face indices are built vectorized."""
+        verts, loop_vidx, loop_totals = template
+        mats = _transform_matrices(locations, scales, rotations)
+        k, n = len(mats), len(verts)
+
+        # Per-instance bevel class; thin parts drop out under min_bevel_size
+        bevel_class = np.zeros(k, dtype=np.int32)
+        if bevel > 0:
+            sizes = np.abs(np.asarray(scales, dtype=np.float64).reshape(-1, 3)).min(axis=1)
+            keep = sizes >= self.min_bevel_size
+            if keep.any():
+                bevel_class[keep] = self.bevel_ids.setdefault(bevel, len(self.bevel_ids) + 1)
+
+        mat_index = self.mat_ids.setdefault(material, len(self.mat_ids))
+
+        offsets = self._vert_count + n * np.arange(k, dtype=np.int32)
+        self.verts.append(np.tile(verts, (k, 1)))
+        self.matrices.append(mats.astype(np.float32))
+        self.vert_counts.extend([n] * k)
+        self.loop_vidx.append((loop_vidx[None, :] + offsets[:, None]).ravel())
+        self.loop_totals.append(np.tile(loop_totals, k))
+        self.mat_indices.append(np.full(k * len(loop_totals), mat_index, dtype=np.int32))
+        self.bevel_classes.append(np.repeat(bevel_class, len(loop_totals)))
+        self._vert_count += k * n
+
+    def add(self, template, location, scale, material, rotation=(0, 0, 0), bevel=0.0):
+        self.add_instances(template, [location], [scale], [rotation], material, bevel)
+
+    def cube(self, location, scale, material, rotation=(0, 0, 0), bevel=0.0):
+        self.add(_template(_unit_cube), location, scale, material, rotation, bevel)
+
+    def cylinder(self, location, scale, material, rotation=(0, 0, 0), vertices=12, bevel=0.0):
+        self.add(_template(_unit_cylinder, vertices), location, scale, material, rotation, bevel)
+
+    def cone(self, location, scale, material, rotation=(0, 0, 0), vertices=10, bevel=0.0):
+        self.add(_template(_unit_cone, vertices), location, scale, material, rotation, bevel)
+
+    def uv_sphere(self, location, scale, material, segments=12, ring_count=8, bevel=0.0):
+        self.add(_template(_unit_uv_sphere, segments, ring_count), location, scale, material, bevel=bevel)
+
+    def cubes(self, descriptors, material, bevel=0.0, rotations=None):
+        """Add a group of cubes from a (K, 6) descriptor table of
+        [x, y, z, sx, sy, sz] rows, all sharing one material and bevel.
+        rotations is an optional (K, 3) XYZ Euler table; None = unrotated."""
+        desc = np.asarray(descriptors, dtype=np.float64).reshape(-1, 6)
+        if rotations is None:
+            rotations = np.zeros((len(desc), 3))
+        self.add_instances(_template(_unit_cube), desc[:, :3], desc[:, 3:],
+                           rotations, material, bevel)
+
+    def cylinders(self, locations, scale, material, rotations=None, vertices=12, bevel=0.0):
+        """Add identical cylinders (one shared scale) at each row of a
+        (K, 3) location table; rotations is an optional (K, 3) XYZ Euler
+        table, None = unrotated."""
+        locations = np.asarray(locations, dtype=np.float64).reshape(-1, 3)
+        if rotations is None:
+            rotations = np.zeros((len(locations), 3))
+        scales = np.broadcast_to(np.asarray(scale, dtype=np.float64), locations.shape)
+        self.add_instances(_template(_unit_cylinder, vertices), locations, scales,
+                           rotations, material, bevel)
+
+    def build(self, name):
+        """Write every collected part into one mesh object named `name`."""
+        # Place all parts at once: one 4x4 per vertex, one einsum
+        per_vert = np.repeat(np.concatenate(self.matrices), self.vert_counts, axis=0)
+        local = np.concatenate(self.verts)
+        co = np.empty((len(local), 3), dtype=np.float32)
+        np.einsum('vij,vj->vi', per_vert[:, :3, :3], local, out=co)
+        co += per_vert[:, :3, 3]
+        loop_vidx = np.concatenate(self.loop_vidx)
+        loop_totals = np.concatenate(self.loop_totals)
+        loop_starts = np.cumsum(loop_totals, dtype=np.int32) - loop_totals
+
+        mesh = commit_mesh(name, co, loop_starts, loop_vidx,
+                           np.concatenate(self.mat_indices), list(self.mat_ids))
+        if self.bevel_ids:
+            _bevel_by_class(mesh, list(self.bevel_ids),
+                            np.concatenate(self.bevel_classes))
+
+        # The mesh is finished before it ever enters the scene: link it once
+        # and pay for a single view-layer update instead of one per step
+        obj = bpy.data.objects.new(name, mesh)
+        bpy.context.collection.objects.link(obj)
+        bpy.context.view_layer.update()
+        return obj
@@ -16,8 +16,11 @@ each body part moves as a solid block, matching the art style.
 """
 
 import bpy
+import bmesh
 import math
-from mathutils import Vector, Euler
+import numpy as np
+from contextlib import contextmanager
+from mathutils import Vector, Euler, Matrix
 
 # ──────────────────────────────────────────────
 #  Utility helpers
@@ -54,72 +57,62 @@ def make_material(name, color, emission=0.0, roughness=0.9):
     return mat
 
 
+def part_matrix(scale, rotation=(0, 0, 0)):
+    """Scale (and rotation, if any) to bake into a part's mesh data —
+    the same result transform_apply(rotation=True, scale=True) gives on a
+    freshly added primitive.  Unrotated parts are a pure diagonal scale."""
+    mat = Matrix.Diagonal((scale[0], scale[1], scale[2], 1.0))
+    if any(rotation):
+        mat = Euler(rotation, 'XYZ').to_matrix().to_4x4() @ mat
+    return mat
+
+
+def new_part(name, location, material, build):
+    """Create a mesh object straight from bmesh, skipping the operator layer.
+    `build(bm)` fills the empty bmesh.  A "UVMap" layer is created first so
+    calc_uvs gives the same UVs as the primitive operators."""
+    bm = bmesh.new()
+    bm.loops.layers.uv.new("UVMap")
+    build(bm)
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    mesh.materials.append(material)
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    bpy.context.collection.objects.link(obj)
+    return obj
+
+
 def add_cube(name, location, scale, material, rotation=(0, 0, 0)):
     """Add a cube, apply rotation+scale, assign material."""
-    bpy.ops.mesh.primitive_cube_add(size=1, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
+    mat = part_matrix(scale, rotation)
+    return new_part(name, location, material, lambda bm: bmesh.ops.create_cube(
+        bm, size=1.0, matrix=mat, calc_uvs=True))
 
 
 def add_wedge(name, location, scale, material, rotation=(0, 0, 0)):
     """Create a 4-sided cone (wedge) for ears/fangs."""
-    bpy.ops.mesh.primitive_cone_add(
-        vertices=4, radius1=0.5, radius2=0.0, depth=1.0,
-        location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
+    mat = part_matrix(scale, rotation)
+    return new_part(name, location, material, lambda bm: bmesh.ops.create_cone(
+        bm, cap_ends=True, cap_tris=False, segments=4,
+        radius1=0.5, radius2=0.0, depth=1.0, matrix=mat, calc_uvs=True))
 
 
 def add_cylinder(name, location, scale, material, rotation=(0, 0, 0), vertices=8):
     """Add a cylinder, apply rotation+scale, assign material."""
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=vertices, radius=0.5, depth=1.0,
-        location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
+    mat = part_matrix(scale, rotation)
+    return new_part(name, location, material, lambda bm: bmesh.ops.create_cone(
+        bm, cap_ends=True, cap_tris=False, segments=vertices,
+        radius1=0.5, radius2=0.5, depth=1.0, matrix=mat, calc_uvs=True))
 
 
 def add_sphere(name, location, scale, material, segments=8, rings=6):
     """Add a UV sphere, apply scale, assign material."""
-    bpy.ops.mesh.primitive_uv_sphere_add(
-        segments=segments, ring_count=rings,
-        radius=0.5, location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
+    mat = part_matrix(scale)
+    return new_part(name, location, material, lambda bm: bmesh.ops.create_uvsphere(
+        bm, u_segments=segments, v_segments=rings, radius=0.5,
+        matrix=mat, calc_uvs=True))
 
 
 def bevel_object(obj, width=0.02, segments=1):
@@ -165,29 +158,44 @@ def parent_to_bone(obj, armature, bone_name):
     bpy.ops.object.parent_set(type='BONE')
 
 
+@contextmanager
+def suspended_depsgraph_handlers():
+    """Detach depsgraph update handlers while the model is being built.
+    Every part add/join/parent otherwise fires the pre/post handlers
+    (add-ons, drivers' helpers, etc.).  The handlers are restored on exit
+    and the depsgraph is evaluated once for the finished rig."""
+    handlers = bpy.app.handlers
+    saved_pre = list(handlers.depsgraph_update_pre)
+    saved_post = list(handlers.depsgraph_update_post)
+    handlers.depsgraph_update_pre.clear()
+    handlers.depsgraph_update_post.clear()
+    try:
+        yield
+    finally:
+        handlers.depsgraph_update_pre.extend(saved_pre)
+        handlers.depsgraph_update_post.extend(saved_post)
+    bpy.context.evaluated_depsgraph_get()
+
+
 # ──────────────────────────────────────────────
 #  Materials
 # ──────────────────────────────────────────────
 
-MAT_SKIN = MAT_SKIN_DK = MAT_MOUTH = MAT_EYES = None
-MAT_CLOTH = MAT_WOOD = MAT_TEETH = MAT_FUSE = None
-MAT_METAL = MAT_BOMB = None
+MATERIALS = {}
 
 def create_materials():
-    global MAT_SKIN, MAT_SKIN_DK, MAT_MOUTH, MAT_EYES
-    global MAT_CLOTH, MAT_WOOD, MAT_TEETH, MAT_FUSE
-    global MAT_METAL, MAT_BOMB
+    """Populate MATERIALS, keyed by the names used in PART_SPECS."""
     # Yellowish-green skin — distinct from orc (bright green) and troll (olive)
-    MAT_SKIN    = make_material("GoblinSkin",     (0.53, 0.67, 0.13, 1.0))
-    MAT_SKIN_DK = make_material("GoblinSkinDark", (0.38, 0.48, 0.08, 1.0))
-    MAT_MOUTH   = make_material("GoblinMouth",    (0.25, 0.08, 0.05, 1.0))
-    MAT_EYES    = make_material("GoblinEyes",     (1.0,  0.9,  0.1,  1.0), emission=5.0)  # bright yellow crazed eyes
-    MAT_CLOTH   = make_material("GoblinCloth",    (0.25, 0.15, 0.08, 1.0))  # ragged brown cloth
-    MAT_WOOD    = make_material("GoblinWood",     (0.35, 0.20, 0.08, 1.0))
-    MAT_TEETH   = make_material("GoblinTeeth",    (0.90, 0.85, 0.60, 1.0))
-    MAT_FUSE    = make_material("GoblinFuse",     (1.0,  0.5,  0.0,  1.0), emission=4.0)  # glowing orange fuse
-    MAT_METAL   = make_material("GoblinMetal",    (0.30, 0.28, 0.26, 1.0), roughness=0.6)
-    MAT_BOMB    = make_material("GoblinBomb",     (0.20, 0.12, 0.06, 1.0))  # dark brown barrel
+    MATERIALS["SKIN"]    = make_material("GoblinSkin",     (0.53, 0.67, 0.13, 1.0))
+    MATERIALS["SKIN_DK"] = make_material("GoblinSkinDark", (0.38, 0.48, 0.08, 1.0))
+    MATERIALS["MOUTH"]   = make_material("GoblinMouth",    (0.25, 0.08, 0.05, 1.0))
+    MATERIALS["EYES"]    = make_material("GoblinEyes",     (1.0,  0.9,  0.1,  1.0), emission=5.0)  # bright yellow crazed eyes
+    MATERIALS["CLOTH"]   = make_material("GoblinCloth",    (0.25, 0.15, 0.08, 1.0))  # ragged brown cloth
+    MATERIALS["WOOD"]    = make_material("GoblinWood",     (0.35, 0.20, 0.08, 1.0))
+    MATERIALS["TEETH"]   = make_material("GoblinTeeth",    (0.90, 0.85, 0.60, 1.0))
+    MATERIALS["FUSE"]    = make_material("GoblinFuse",     (1.0,  0.5,  0.0,  1.0), emission=4.0)  # glowing orange fuse
+    MATERIALS["METAL"]   = make_material("GoblinMetal",    (0.30, 0.28, 0.26, 1.0), roughness=0.6)
+    MATERIALS["BOMB"]    = make_material("GoblinBomb",     (0.20, 0.12, 0.06, 1.0))  # dark brown barrel
 
 
 # ──────────────────────────────────────────────
@@ -200,177 +208,99 @@ def create_materials():
 
 Z_OFF = 0.09  # raise all parts so feet touch ground
 
-def build_body_parts():
-    """Create all mesh parts, grouped by bone assignment.
-    Returns dict: bone_name -> single joined mesh object."""
-
-    groups = {}
-
-    def z(val):
-        return val + Z_OFF
-
+# One row per mesh part, in build order:
+#   (bone group, name, primitive, location, scale, material, rotation°, bevel, extra)
+# Locations are given before Z_OFF is applied.  Parts sharing a bone group
+# are joined into "Grp_<bone>"; a group with a single part keeps its name.
+PART_SPECS = [
     # ── SPINE (scrawny torso + bomb barrel + rope bindings) ──
-    parts = []
     # Narrow chest — much thinner than orc
-    parts.append(add_cube("Torso", (0, 0, z(0.36)),
-                          (0.26, 0.18, 0.22), MAT_SKIN))
-    bevel_object(parts[-1], 0.02)
+    ("Spine", "Torso",       "cube",     (0, 0, 0.36),      (0.26, 0.18, 0.22), "SKIN",  None, 0.02, {}),
     # Ragged cloth wrap around waist
-    parts.append(add_cube("WaistCloth", (0, 0, z(0.22)),
-                          (0.28, 0.20, 0.06), MAT_CLOTH))
-    bevel_object(parts[-1], 0.01)
+    ("Spine", "WaistCloth",  "cube",     (0, 0, 0.22),      (0.28, 0.20, 0.06), "CLOTH", None, 0.01, {}),
     # Ragged cloth strip hanging
-    parts.append(add_cube("Loincloth", (0, -0.08, z(0.14)),
-                          (0.14, 0.03, 0.12), MAT_CLOTH))
-    bevel_object(parts[-1], 0.01)
-
-    # ── BOMB BARREL — worn as a backpack, long axis vertical (Z) ──
-    # Barrel roughly torso-sized, sitting on the goblin's back
-    parts.append(add_cylinder("BombBarrel", (0, 0.14, z(0.34)),
-                              (0.12, 0.12, 0.24), MAT_BOMB,
-                              vertices=8))
-    bevel_object(parts[-1], 0.01)
+    ("Spine", "Loincloth",   "cube",     (0, -0.08, 0.14),  (0.14, 0.03, 0.12), "CLOTH", None, 0.01, {}),
+    # Bomb barrel — worn as a backpack, long axis vertical (Z)
+    ("Spine", "BombBarrel",  "cylinder", (0, 0.14, 0.34),   (0.12, 0.12, 0.24), "BOMB",  None, 0.01, {"vertices": 8}),
     # Metal bands around barrel (horizontal rings)
-    parts.append(add_cylinder("BarrelBand1", (0, 0.14, z(0.28)),
-                              (0.13, 0.13, 0.02), MAT_METAL,
-                              vertices=8))
-    parts.append(add_cylinder("BarrelBand2", (0, 0.14, z(0.40)),
-                              (0.13, 0.13, 0.02), MAT_METAL,
-                              vertices=8))
-    # Rope strap over left shoulder
-    parts.append(add_cube("RopeL", (-0.06, 0.04, z(0.40)),
-                          (0.04, 0.16, 0.20), MAT_CLOTH,
-                          rotation=(0, 0, math.radians(15))))
-    bevel_object(parts[-1], 0.005)
-    # Rope strap over right shoulder
-    parts.append(add_cube("RopeR", (0.06, 0.04, z(0.40)),
-                          (0.04, 0.16, 0.20), MAT_CLOTH,
-                          rotation=(0, 0, math.radians(-15))))
-    bevel_object(parts[-1], 0.005)
-    # Fuse sticking out the top of the barrel (glowing!)
-    parts.append(add_cylinder("Fuse", (0, 0.14, z(0.50)),
-                              (0.015, 0.015, 0.10), MAT_FUSE,
-                              vertices=6))
-    # Fuse spark tip at the top
-    parts.append(add_sphere("FuseSpark", (0, 0.14, z(0.56)),
-                            (0.03, 0.03, 0.03), MAT_FUSE, segments=6, rings=4))
-
-    for p in parts:
-        apply_modifiers(p)
-    groups["Spine"] = join_objects(parts, "Grp_Spine")
+    ("Spine", "BarrelBand1", "cylinder", (0, 0.14, 0.28),   (0.13, 0.13, 0.02), "METAL", None, 0.0,  {"vertices": 8}),
+    ("Spine", "BarrelBand2", "cylinder", (0, 0.14, 0.40),   (0.13, 0.13, 0.02), "METAL", None, 0.0,  {"vertices": 8}),
+    # Rope straps over each shoulder
+    ("Spine", "RopeL",       "cube",     (-0.06, 0.04, 0.40), (0.04, 0.16, 0.20), "CLOTH", (0, 0, 15),  0.005, {}),
+    ("Spine", "RopeR",       "cube",     (0.06, 0.04, 0.40),  (0.04, 0.16, 0.20), "CLOTH", (0, 0, -15), 0.005, {}),
+    # Fuse sticking out the top of the barrel (glowing!) + spark tip
+    ("Spine", "Fuse",        "cylinder", (0, 0.14, 0.50),   (0.015, 0.015, 0.10), "FUSE", None, 0.0, {"vertices": 6}),
+    ("Spine", "FuseSpark",   "sphere",   (0, 0.14, 0.56),   (0.03, 0.03, 0.03),   "FUSE", None, 0.0, {"segments": 6, "rings": 4}),
 
     # ── HEAD (oversized goblin head + huge eyes + pointy ears + sharp nose + grin) ──
-    parts = []
     # Big round-ish head — proportionally larger than orc
-    parts.append(add_cube("Head", (0, 0, z(0.58)),
-                          (0.30, 0.26, 0.24), MAT_SKIN))
-    bevel_object(parts[-1], 0.04)
+    ("Head", "Head",    "cube",  (0, 0, 0.58),        (0.30, 0.26, 0.24), "SKIN",    None, 0.04, {}),
     # Prominent brow ridge
-    parts.append(add_cube("Brow", (0, -0.12, z(0.64)),
-                          (0.28, 0.06, 0.05), MAT_SKIN_DK))
-    bevel_object(parts[-1], 0.02)
+    ("Head", "Brow",    "cube",  (0, -0.12, 0.64),    (0.28, 0.06, 0.05), "SKIN_DK", None, 0.02, {}),
     # Big bulging crazed eyes — larger than orc, yellow glow
-    parts.append(add_cube("EyeL", (-0.09, -0.13, z(0.60)),
-                          (0.08, 0.06, 0.06), MAT_EYES))
-    parts.append(add_cube("EyeR", ( 0.09, -0.13, z(0.60)),
-                          (0.08, 0.06, 0.06), MAT_EYES))
+    ("Head", "EyeL",    "cube",  (-0.09, -0.13, 0.60), (0.08, 0.06, 0.06), "EYES",   None, 0.0,  {}),
+    ("Head", "EyeR",    "cube",  (0.09, -0.13, 0.60),  (0.08, 0.06, 0.06), "EYES",   None, 0.0,  {}),
     # Long pointy nose
-    parts.append(add_wedge("Nose", (0, -0.18, z(0.57)),
-                           (0.06, 0.08, 0.08), MAT_SKIN_DK,
-                           rotation=(math.radians(-90), 0, 0)))
+    ("Head", "Nose",    "wedge", (0, -0.18, 0.57),    (0.06, 0.08, 0.08), "SKIN_DK", (-90, 0, 0), 0.0, {}),
     # Wide toothy grin
-    parts.append(add_cube("Mouth", (0, -0.13, z(0.50)),
-                          (0.16, 0.04, 0.04), MAT_MOUTH))
+    ("Head", "Mouth",   "cube",  (0, -0.13, 0.50),    (0.16, 0.04, 0.04), "MOUTH",   None, 0.0,  {}),
     # Jagged teeth along the grin
-    parts.append(add_wedge("ToothL1", (-0.05, -0.15, z(0.52)),
-                           (0.03, 0.02, 0.04), MAT_TEETH))
-    parts.append(add_wedge("ToothR1", ( 0.05, -0.15, z(0.52)),
-                           (0.03, 0.02, 0.04), MAT_TEETH))
-    parts.append(add_wedge("ToothC",  ( 0.00, -0.15, z(0.52)),
-                           (0.03, 0.02, 0.04), MAT_TEETH))
+    ("Head", "ToothL1", "wedge", (-0.05, -0.15, 0.52), (0.03, 0.02, 0.04), "TEETH",  None, 0.0,  {}),
+    ("Head", "ToothR1", "wedge", (0.05, -0.15, 0.52),  (0.03, 0.02, 0.04), "TEETH",  None, 0.0,  {}),
+    ("Head", "ToothC",  "wedge", (0.00, -0.15, 0.52),  (0.03, 0.02, 0.04), "TEETH",  None, 0.0,  {}),
     # Big pointy ears — larger than orc, sticking out
-    parts.append(add_wedge("EarL", (-0.22, 0, z(0.60)),
-                           (0.06, 0.14, 0.16), MAT_SKIN_DK,
-                           rotation=(0, 0, math.radians(-40))))
-    parts.append(add_wedge("EarR", ( 0.22, 0, z(0.60)),
-                           (0.06, 0.14, 0.16), MAT_SKIN_DK,
-                           rotation=(0, 0, math.radians(40))))
-    for p in parts:
-        apply_modifiers(p)
-    groups["Head"] = join_objects(parts, "Grp_Head")
-
-    # ── LEFT UPPER ARM — scrawny ──
-    p = add_cube("ArmLUpper", (-0.20, 0, z(0.40)),
-                 (0.10, 0.10, 0.16), MAT_SKIN)
-    bevel_object(p, 0.02); apply_modifiers(p)
-    groups["L_UpperArm"] = p
-
-    # ── LEFT FOREARM + HAND ──
-    parts = []
-    parts.append(add_cube("ArmLLower", (-0.22, -0.02, z(0.26)),
-                          (0.09, 0.09, 0.14), MAT_SKIN))
-    bevel_object(parts[-1], 0.02)
-    parts.append(add_cube("HandL", (-0.22, -0.04, z(0.18)),
-                          (0.08, 0.08, 0.06), MAT_SKIN_DK))
-    bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
-    groups["L_ForeArm"] = join_objects(parts, "Grp_L_ForeArm")
-
-    # ── RIGHT UPPER ARM — scrawny ──
-    p = add_cube("ArmRUpper", (0.20, 0, z(0.40)),
-                 (0.10, 0.10, 0.16), MAT_SKIN)
-    bevel_object(p, 0.02); apply_modifiers(p)
-    groups["R_UpperArm"] = p
-
-    # ── RIGHT FOREARM + HAND (no weapon — bomb is on chest) ──
-    parts = []
-    parts.append(add_cube("ArmRLower", (0.22, -0.02, z(0.26)),
-                          (0.09, 0.09, 0.14), MAT_SKIN))
-    bevel_object(parts[-1], 0.02)
-    parts.append(add_cube("HandR", (0.22, -0.04, z(0.18)),
-                          (0.08, 0.08, 0.06), MAT_SKIN_DK))
-    bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
-    groups["R_ForeArm"] = join_objects(parts, "Grp_R_ForeArm")
-
-    # ── LEFT UPPER LEG — thin ──
-    p = add_cube("LegLUpper", (-0.08, 0, z(0.10)),
-                 (0.10, 0.12, 0.16), MAT_SKIN)
-    bevel_object(p, 0.02); apply_modifiers(p)
-    groups["L_UpperLeg"] = p
-
-    # ── LEFT LOWER LEG + FOOT ──
-    parts = []
-    parts.append(add_cube("LegLLower", (-0.08, 0, z(-0.02)),
-                          (0.09, 0.10, 0.12), MAT_CLOTH))
-    bevel_object(parts[-1], 0.02)
-    parts.append(add_cube("FootL", (-0.08, -0.04, z(-0.06)),
-                          (0.10, 0.16, 0.06), MAT_CLOTH))
-    bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
-    groups["L_LowerLeg"] = join_objects(parts, "Grp_L_LowerLeg")
-
-    # ── RIGHT UPPER LEG — thin ──
-    p = add_cube("LegRUpper", (0.08, 0, z(0.10)),
-                 (0.10, 0.12, 0.16), MAT_SKIN)
-    bevel_object(p, 0.02); apply_modifiers(p)
-    groups["R_UpperLeg"] = p
-
-    # ── RIGHT LOWER LEG + FOOT ──
-    parts = []
-    parts.append(add_cube("LegRLower", (0.08, 0, z(-0.02)),
-                          (0.09, 0.10, 0.12), MAT_CLOTH))
-    bevel_object(parts[-1], 0.02)
-    parts.append(add_cube("FootR", (0.08, -0.04, z(-0.06)),
-                          (0.10, 0.16, 0.06), MAT_CLOTH))
-    bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
-    groups["R_LowerLeg"] = join_objects(parts, "Grp_R_LowerLeg")
+    ("Head", "EarL",    "wedge", (-0.22, 0, 0.60),    (0.06, 0.14, 0.16), "SKIN_DK", (0, 0, -40), 0.0, {}),
+    ("Head", "EarR",    "wedge", (0.22, 0, 0.60),     (0.06, 0.14, 0.16), "SKIN_DK", (0, 0, 40),  0.0, {}),
+
+    # ── ARMS — scrawny; right hand is empty (bomb is on the back) ──
+    ("L_UpperArm", "ArmLUpper", "cube", (-0.20, 0, 0.40),     (0.10, 0.10, 0.16), "SKIN",    None, 0.02, {}),
+    ("L_ForeArm",  "ArmLLower", "cube", (-0.22, -0.02, 0.26), (0.09, 0.09, 0.14), "SKIN",    None, 0.02, {}),
+    ("L_ForeArm",  "HandL",     "cube", (-0.22, -0.04, 0.18), (0.08, 0.08, 0.06), "SKIN_DK", None, 0.02, {}),
+    ("R_UpperArm", "ArmRUpper", "cube", (0.20, 0, 0.40),      (0.10, 0.10, 0.16), "SKIN",    None, 0.02, {}),
+    ("R_ForeArm",  "ArmRLower", "cube", (0.22, -0.02, 0.26),  (0.09, 0.09, 0.14), "SKIN",    None, 0.02, {}),
+    ("R_ForeArm",  "HandR",     "cube", (0.22, -0.04, 0.18),  (0.08, 0.08, 0.06), "SKIN_DK", None, 0.02, {}),
+
+    # ── LEGS — thin ──
+    ("L_UpperLeg", "LegLUpper", "cube", (-0.08, 0, 0.10),     (0.10, 0.12, 0.16), "SKIN",  None, 0.02, {}),
+    ("L_LowerLeg", "LegLLower", "cube", (-0.08, 0, -0.02),    (0.09, 0.10, 0.12), "CLOTH", None, 0.02, {}),
+    ("L_LowerLeg", "FootL",     "cube", (-0.08, -0.04, -0.06), (0.10, 0.16, 0.06), "CLOTH", None, 0.02, {}),
+    ("R_UpperLeg", "LegRUpper", "cube", (0.08, 0, 0.10),      (0.10, 0.12, 0.16), "SKIN",  None, 0.02, {}),
+    ("R_LowerLeg", "LegRLower", "cube", (0.08, 0, -0.02),     (0.09, 0.10, 0.12), "CLOTH", None, 0.02, {}),
+    ("R_LowerLeg", "FootR",     "cube", (0.08, -0.04, -0.06), (0.10, 0.16, 0.06), "CLOTH", None, 0.02, {}),
+]
+
+PRIMITIVE_BUILDERS = {
+    "cube":     add_cube,
+    "wedge":    add_wedge,
+    "cylinder": add_cylinder,
+    "sphere":   add_sphere,
+}
+
+
+def build_body_parts():
+    """Create all mesh parts from PART_SPECS, grouped by bone assignment.
+    Returns dict: bone_name -> single joined mesh object."""
+
+    grouped = {}
+    for group, name, kind, loc, scale, mat_key, rot_deg, bevel, extra in PART_SPECS:
+        location = (loc[0], loc[1], loc[2] + Z_OFF)
+        kwargs = dict(extra)
+        if rot_deg is not None:
+            kwargs["rotation"] = tuple(math.radians(a) for a in rot_deg)
+        obj = PRIMITIVE_BUILDERS[kind](name, location, scale,
+                                       MATERIALS[mat_key], **kwargs)
+        if bevel > 0:
+            bevel_object(obj, bevel)
+        grouped.setdefault(group, []).append(obj)
 
+    groups = {}
+    for group, parts in grouped.items():
+        for p in parts:
+            apply_modifiers(p)
+        if len(parts) == 1:
+            groups[group] = parts[0]
+        else:
+            groups[group] = join_objects(parts, "Grp_" + group)
     return groups
 
 
@@ -443,267 +373,198 @@ def rig_model(arm_obj, groups):
 #  Animations
 # ──────────────────────────────────────────────
 
-def set_bone_rot(pose_bone, x_deg, y_deg, z_deg):
-    """Set rotation in Euler degrees."""
-    pose_bone.rotation_mode = 'XYZ'
-    pose_bone.rotation_euler = (
-        math.radians(x_deg),
-        math.radians(y_deg),
-        math.radians(z_deg)
-    )
-
-
-def set_bone_loc(pose_bone, x, y, z_val):
-    """Set bone location offset."""
-    pose_bone.location = (x, y, z_val)
-
-
-def key_all_bones(arm_obj, frame):
-    """Insert keyframes for rotation & location on all pose bones."""
-    for pb in arm_obj.pose.bones:
-        pb.keyframe_insert(data_path="rotation_euler", frame=frame)
-        pb.keyframe_insert(data_path="location", frame=frame)
-
+# Each clip is a list of poses: (frame, {bone: rotation°}, {bone: location}).
+# Bones not listed in a pose are keyed at rest, exactly as the old
+# reset_pose → set_bone_* → key_all_bones sequence did.
 
-def reset_pose(arm_obj):
-    """Reset all pose bones to rest."""
-    for pb in arm_obj.pose.bones:
-        pb.rotation_mode = 'XYZ'
-        pb.rotation_euler = (0, 0, 0)
-        pb.location = (0, 0, 0)
-
-
-def create_walk_cycle(arm_obj):
-    """Frantic running cycle — 24 frames at 24fps = 1 second.
-    Faster and more exaggerated than orc walk — this goblin is sprinting
-    with a bomb strapped to its chest. Hunched forward, arms pumping."""
-    action = bpy.data.actions.new("Walk")
-    arm_obj.animation_data_create()
-    arm_obj.animation_data.action = action
-
-    pb = arm_obj.pose.bones
-    swing = 40   # leg swing angle (bigger than orc's 30 — frantic run)
-    arm_sw = 35  # arm counter-swing (bigger — arms pumping wildly)
-    bob = 0.03   # more bounce in the run
-
-    # Hunched-forward base posture for all frames
-    hunch_spine = 12   # spine tilted forward (running posture)
-    hunch_head = -8    # head looking up despite hunched body
+WALK_SWING = 40    # leg swing angle (bigger than orc's 30 — frantic run)
+WALK_ARM_SW = 35   # arm counter-swing (bigger — arms pumping wildly)
+WALK_BOB = 0.03    # more bounce in the run
+HUNCH_SPINE = 12   # spine tilted forward (running posture)
+HUNCH_HEAD = -8    # head looking up despite hunched body
 
+# Frantic running cycle — 24 frames at 24fps = 1 second.
+# Faster and more exaggerated than orc walk — this goblin is sprinting
+# with a bomb strapped to its chest. Hunched forward, arms pumping.
+WALK_POSES = [
     # Frame 1: neutral (start of loop) — hunched
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"], hunch_spine, 0, 0)
-    set_bone_rot(pb["Head"], hunch_head, 0, 0)
-    key_all_bones(arm_obj, 1)
-
+    (1, {"Spine": (HUNCH_SPINE, 0, 0), "Head": (HUNCH_HEAD, 0, 0)}, {}),
     # Frame 7: left leg forward, right leg back
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"], hunch_spine, 0, 5)
-    set_bone_rot(pb["Head"], hunch_head, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"],  swing, 0, 0)
-    set_bone_rot(pb["L_LowerLeg"], -swing*0.4, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"], -swing, 0, 0)
-    set_bone_rot(pb["R_LowerLeg"],  0, 0, 0)
-    set_bone_rot(pb["R_UpperArm"],  arm_sw, 0, 0)
-    set_bone_rot(pb["R_ForeArm"],  -arm_sw*0.5, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -arm_sw, 0, 0)
-    set_bone_rot(pb["L_ForeArm"],   0, 0, 0)
-    set_bone_loc(pb["Root"], 0, 0, bob)
-    key_all_bones(arm_obj, 7)
-
+    (7, {"Spine":      (HUNCH_SPINE, 0, 5),
+         "Head":       (HUNCH_HEAD, 0, 0),
+         "L_UpperLeg": (WALK_SWING, 0, 0),
+         "L_LowerLeg": (-WALK_SWING*0.4, 0, 0),
+         "R_UpperLeg": (-WALK_SWING, 0, 0),
+         "R_UpperArm": (WALK_ARM_SW, 0, 0),
+         "R_ForeArm":  (-WALK_ARM_SW*0.5, 0, 0),
+         "L_UpperArm": (-WALK_ARM_SW, 0, 0)},
+        {"Root": (0, 0, WALK_BOB)}),
     # Frame 13: neutral (mid loop)
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"], hunch_spine, 0, 0)
-    set_bone_rot(pb["Head"], hunch_head, 0, 0)
-    key_all_bones(arm_obj, 13)
-
+    (13, {"Spine": (HUNCH_SPINE, 0, 0), "Head": (HUNCH_HEAD, 0, 0)}, {}),
     # Frame 19: right leg forward, left leg back (mirror of frame 7)
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"], hunch_spine, 0, -5)
-    set_bone_rot(pb["Head"], hunch_head, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"],  swing, 0, 0)
-    set_bone_rot(pb["R_LowerLeg"], -swing*0.4, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"], -swing, 0, 0)
-    set_bone_rot(pb["L_LowerLeg"],  0, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],  arm_sw, 0, 0)
-    set_bone_rot(pb["L_ForeArm"],  -arm_sw*0.5, 0, 0)
-    set_bone_rot(pb["R_UpperArm"], -arm_sw, 0, 0)
-    set_bone_rot(pb["R_ForeArm"],   0, 0, 0)
-    set_bone_loc(pb["Root"], 0, 0, bob)
-    key_all_bones(arm_obj, 19)
-
+    (19, {"Spine":      (HUNCH_SPINE, 0, -5),
+          "Head":       (HUNCH_HEAD, 0, 0),
+          "R_UpperLeg": (WALK_SWING, 0, 0),
+          "R_LowerLeg": (-WALK_SWING*0.4, 0, 0),
+          "L_UpperLeg": (-WALK_SWING, 0, 0),
+          "L_UpperArm": (WALK_ARM_SW, 0, 0),
+          "L_ForeArm":  (-WALK_ARM_SW*0.5, 0, 0),
+          "R_UpperArm": (-WALK_ARM_SW, 0, 0)},
+         {"Root": (0, 0, WALK_BOB)}),
     # Frame 25: same as frame 1 for seamless loop
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"], hunch_spine, 0, 0)
-    set_bone_rot(pb["Head"], hunch_head, 0, 0)
-    key_all_bones(arm_obj, 25)
-
-    for fc in action.fcurves:
-        for kp in fc.keyframe_points:
-            kp.interpolation = 'LINEAR'
-
-    action.use_fake_user = True
-    print("  Walk cycle created (frames 1-25, frantic run loop)")
-    return action
-
-
-def create_attack_anim(arm_obj):
-    """Detonation animation — goblin hunches over bomb, then spreads arms
-    wide as it explodes. 20 frames."""
-    action = bpy.data.actions.new("Attack")
-    arm_obj.animation_data.action = action
-
-    pb = arm_obj.pose.bones
+    (25, {"Spine": (HUNCH_SPINE, 0, 0), "Head": (HUNCH_HEAD, 0, 0)}, {}),
+]
 
+# Detonation animation — goblin hunches over bomb, then spreads arms
+# wide as it explodes. 20 frames.
+ATTACK_POSES = [
     # Frame 1: rest (hunched running posture)
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"], 12, 0, 0)
-    set_bone_rot(pb["Head"], -8, 0, 0)
-    key_all_bones(arm_obj, 1)
-
+    (1, {"Spine": (12, 0, 0), "Head": (-8, 0, 0)}, {}),
     # Frame 4: hunch over the bomb — curling inward
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],       25, 0, 0)    # lean far forward over bomb
-    set_bone_rot(pb["Head"],       -15, 0, 0)    # head tucked
-    set_bone_rot(pb["R_UpperArm"],  20, 0, -30)  # arms wrapping around bomb
-    set_bone_rot(pb["R_ForeArm"],  -40, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],  20, 0, 30)
-    set_bone_rot(pb["L_ForeArm"],  -40, 0, 0)
-    set_bone_loc(pb["Root"], 0, 0, -0.03)        # crouch down
-    key_all_bones(arm_obj, 4)
-
+    (4, {"Spine":      (25, 0, 0),      # lean far forward over bomb
+         "Head":       (-15, 0, 0),     # head tucked
+         "R_UpperArm": (20, 0, -30),    # arms wrapping around bomb
+         "R_ForeArm":  (-40, 0, 0),
+         "L_UpperArm": (20, 0, 30),
+         "L_ForeArm":  (-40, 0, 0)},
+        {"Root": (0, 0, -0.03)}),       # crouch down
     # Frame 7: maximum curl — about to detonate
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],       30, 0, 0)    # maximum hunch
-    set_bone_rot(pb["Head"],       -20, 0, 0)    # head down
-    set_bone_rot(pb["R_UpperArm"],  30, 0, -40)  # arms tight around bomb
-    set_bone_rot(pb["R_ForeArm"],  -50, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],  30, 0, 40)
-    set_bone_rot(pb["L_ForeArm"],  -50, 0, 0)
-    set_bone_loc(pb["Root"], 0, 0, -0.05)        # deep crouch
-    key_all_bones(arm_obj, 7)
-
+    (7, {"Spine":      (30, 0, 0),      # maximum hunch
+         "Head":       (-20, 0, 0),     # head down
+         "R_UpperArm": (30, 0, -40),    # arms tight around bomb
+         "R_ForeArm":  (-50, 0, 0),
+         "L_UpperArm": (30, 0, 40),
+         "L_ForeArm":  (-50, 0, 0)},
+        {"Root": (0, 0, -0.05)}),       # deep crouch
     # Frame 10: BOOM — arms flung wide, torso snaps upright
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],      -15, 0, 0)    # torso snaps backward
-    set_bone_rot(pb["Head"],        20, 0, 0)    # head thrown back
-    set_bone_rot(pb["R_UpperArm"],   0, 0, -80)  # arms flung up and out
-    set_bone_rot(pb["R_ForeArm"],  -20, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],   0, 0, 80)   # mirror
-    set_bone_rot(pb["L_ForeArm"],  -20, 0, 0)
-    set_bone_loc(pb["Root"], 0, 0, 0.04)         # launched upward slightly
-    key_all_bones(arm_obj, 10)
-
+    (10, {"Spine":      (-15, 0, 0),    # torso snaps backward
+          "Head":       (20, 0, 0),     # head thrown back
+          "R_UpperArm": (0, 0, -80),    # arms flung up and out
+          "R_ForeArm":  (-20, 0, 0),
+          "L_UpperArm": (0, 0, 80),     # mirror
+          "L_ForeArm":  (-20, 0, 0)},
+         {"Root": (0, 0, 0.04)}),       # launched upward slightly
     # Frame 14: explosion hold — spread eagle
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],      -10, 0, 0)
-    set_bone_rot(pb["Head"],        15, 0, 0)
-    set_bone_rot(pb["R_UpperArm"],   0, 0, -90)  # arms fully out
-    set_bone_rot(pb["R_ForeArm"],    0, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],   0, 0, 90)
-    set_bone_rot(pb["L_ForeArm"],    0, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"], -20, 0, -15)  # legs spread
-    set_bone_rot(pb["R_UpperLeg"], -20, 0, 15)
-    set_bone_loc(pb["Root"], 0, 0, 0.02)
-    key_all_bones(arm_obj, 14)
-
+    (14, {"Spine":      (-10, 0, 0),
+          "Head":       (15, 0, 0),
+          "R_UpperArm": (0, 0, -90),    # arms fully out
+          "L_UpperArm": (0, 0, 90),
+          "L_UpperLeg": (-20, 0, -15),  # legs spread
+          "R_UpperLeg": (-20, 0, 15)},
+         {"Root": (0, 0, 0.02)}),
     # Frame 20: slump — post-explosion
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],       40, 0, 0)    # collapse forward
-    set_bone_rot(pb["Head"],       -30, 0, 10)   # head hanging
-    set_bone_rot(pb["R_UpperArm"],  15, 0, 20)   # arms limp
-    set_bone_rot(pb["R_ForeArm"],  -30, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],  15, 0, -20)
-    set_bone_rot(pb["L_ForeArm"],  -30, 0, 0)
-    set_bone_loc(pb["Root"], 0, -0.10, -0.05)    # dropped down
-    key_all_bones(arm_obj, 20)
-
-    for fc in action.fcurves:
-        for kp in fc.keyframe_points:
-            kp.interpolation = 'BEZIER'
-
-    action.use_fake_user = True
-    print("  Attack animation created (frames 1-20, detonation)")
-    return action
-
-
-def create_die_anim(arm_obj):
-    """Collapse forward — 30 frames. Since the goblin usually dies by
-    self-detonation, this is for when it gets killed before reaching
-    its target. Quick crumple forward."""
-    action = bpy.data.actions.new("Die")
-    arm_obj.animation_data.action = action
-
-    pb = arm_obj.pose.bones
-
+    (20, {"Spine":      (40, 0, 0),     # collapse forward
+          "Head":       (-30, 0, 10),   # head hanging
+          "R_UpperArm": (15, 0, 20),    # arms limp
+          "R_ForeArm":  (-30, 0, 0),
+          "L_UpperArm": (15, 0, -20),
+          "L_ForeArm":  (-30, 0, 0)},
+         {"Root": (0, -0.10, -0.05)}),  # dropped down
+]
+
+# Collapse forward — 30 frames. Since the goblin usually dies by
+# self-detonation, this is for when it gets killed before reaching
+# its target. Quick crumple forward.
+DIE_POSES = [
     # Frame 1: alive (hunched running posture)
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"], 12, 0, 0)
-    set_bone_rot(pb["Head"], -8, 0, 0)
-    key_all_bones(arm_obj, 1)
-
+    (1, {"Spine": (12, 0, 0), "Head": (-8, 0, 0)}, {}),
     # Frame 6: hit stagger — stumble forward
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],    25, 0, 0)
-    set_bone_rot(pb["Head"],     15, 0, 5)
-    set_bone_rot(pb["R_UpperArm"], 10, 0, 20)
-    set_bone_rot(pb["L_UpperArm"], 10, 0, -20)
-    set_bone_loc(pb["Root"], 0, -0.02, 0)
-    key_all_bones(arm_obj, 6)
-
+    (6, {"Spine":      (25, 0, 0),
+         "Head":       (15, 0, 5),
+         "R_UpperArm": (10, 0, 20),
+         "L_UpperArm": (10, 0, -20)},
+        {"Root": (0, -0.02, 0)}),
     # Frame 12: knees buckling — dropping forward
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],    40, 0, 3)
-    set_bone_rot(pb["Head"],    -10, 0, -5)
-    set_bone_rot(pb["R_UpperArm"], -10, 0, 30)
-    set_bone_rot(pb["R_ForeArm"],  -20, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -10, 0, -30)
-    set_bone_rot(pb["L_ForeArm"],  -20, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"], 30, 0, 0)
-    set_bone_rot(pb["L_LowerLeg"], -40, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"], 30, 0, 0)
-    set_bone_rot(pb["R_LowerLeg"], -40, 0, 0)
-    set_bone_loc(pb["Root"], 0, -0.10, -0.05)
-    key_all_bones(arm_obj, 12)
-
+    (12, {"Spine":      (40, 0, 3),
+          "Head":       (-10, 0, -5),
+          "R_UpperArm": (-10, 0, 30),
+          "R_ForeArm":  (-20, 0, 0),
+          "L_UpperArm": (-10, 0, -30),
+          "L_ForeArm":  (-20, 0, 0),
+          "L_UpperLeg": (30, 0, 0),
+          "L_LowerLeg": (-40, 0, 0),
+          "R_UpperLeg": (30, 0, 0),
+          "R_LowerLeg": (-40, 0, 0)},
+         {"Root": (0, -0.10, -0.05)}),
     # Frame 20: falling face-first
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],    60, 0, 5)
-    set_bone_rot(pb["Head"],    -20, 0, -10)
-    set_bone_rot(pb["R_UpperArm"], -30, 0, 45)
-    set_bone_rot(pb["R_ForeArm"],  -30, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -30, 0, -45)
-    set_bone_rot(pb["L_ForeArm"],  -30, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"], 50, 0, 0)
-    set_bone_rot(pb["L_LowerLeg"], -60, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"], 50, 0, 0)
-    set_bone_rot(pb["R_LowerLeg"], -60, 0, 0)
-    set_bone_loc(pb["Root"], 0, -0.20, -0.10)
-    key_all_bones(arm_obj, 20)
-
+    (20, {"Spine":      (60, 0, 5),
+          "Head":       (-20, 0, -10),
+          "R_UpperArm": (-30, 0, 45),
+          "R_ForeArm":  (-30, 0, 0),
+          "L_UpperArm": (-30, 0, -45),
+          "L_ForeArm":  (-30, 0, 0),
+          "L_UpperLeg": (50, 0, 0),
+          "L_LowerLeg": (-60, 0, 0),
+          "R_UpperLeg": (50, 0, 0),
+          "R_LowerLeg": (-60, 0, 0)},
+         {"Root": (0, -0.20, -0.10)}),
     # Frame 30: face-down on the ground — crumpled heap
     # Values captured from manual pose in Blender
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],       80.0,    0.0,    5.0)
-    set_bone_rot(pb["Head"],         2.8,    6.9,  -10.0)
-    set_bone_rot(pb["R_UpperArm"],  25.8,  -37.9,  -50.8)
-    set_bone_rot(pb["R_ForeArm"],   23.6,   -4.5,  -55.3)
-    set_bone_rot(pb["L_UpperArm"],  40.5,   25.2,   34.6)
-    set_bone_rot(pb["L_ForeArm"],   37.2,    7.3,   54.8)
-    set_bone_rot(pb["L_UpperLeg"],  89.5,  -29.0,   -9.8)
-    set_bone_rot(pb["L_LowerLeg"],  -8.9,   70.0,   91.2)
-    set_bone_rot(pb["R_UpperLeg"],  98.0,   37.7,   18.0)
-    set_bone_rot(pb["R_LowerLeg"], -44.3,  -65.5,  -53.1)
-    set_bone_loc(pb["Root"], 0, -0.30, -0.15)
-    key_all_bones(arm_obj, 30)
-
-    for fc in action.fcurves:
-        for kp in fc.keyframe_points:
-            kp.interpolation = 'BEZIER'
-
-    action.use_fake_user = True
-    print("  Die animation created (frames 1-30, face-down collapse)")
-    return action
+    (30, {"Spine":      (80.0,    0.0,    5.0),
+          "Head":       (2.8,     6.9,  -10.0),
+          "R_UpperArm": (25.8,  -37.9,  -50.8),
+          "R_ForeArm":  (23.6,   -4.5,  -55.3),
+          "L_UpperArm": (40.5,   25.2,   34.6),
+          "L_ForeArm":  (37.2,    7.3,   54.8),
+          "L_UpperLeg": (89.5,  -29.0,   -9.8),
+          "L_LowerLeg": (-8.9,   70.0,   91.2),
+          "R_UpperLeg": (98.0,   37.7,   18.0),
+          "R_LowerLeg": (-44.3, -65.5,  -53.1)},
+         {"Root": (0, -0.30, -0.15)}),
+]
+
+# (action name, poses, interpolation, log line)
+ANIMATIONS = [
+    ("Walk",   WALK_POSES,   'LINEAR', "Walk cycle created (frames 1-25, frantic run loop)"),
+    ("Attack", ATTACK_POSES, 'BEZIER', "Attack animation created (frames 1-20, detonation)"),
+    ("Die",    DIE_POSES,    'BEZIER', "Die animation created (frames 1-30, face-down collapse)"),
+]
+
+
+def build_all_animations(arm_obj):
+    """Write every clip in ANIMATIONS in one pass.
+    Each action's keys are laid out in a (n_bones*6, n_frames) array —
+    rotation XYZ then location XYZ per bone — and pushed into its fcurves
+    with a single foreach_set, instead of posing and keyframe_insert-ing
+    every bone on every frame.  Returns the actions in ANIMATIONS order."""
+    arm_obj.animation_data_create()
+    bone_names = [pb.name for pb in arm_obj.pose.bones]
+    row_of = {name: i * 6 for i, name in enumerate(bone_names)}
+    for pb in arm_obj.pose.bones:
+        pb.rotation_mode = 'XYZ'
+
+    interp_ids = bpy.types.Keyframe.bl_rna.properties["interpolation"].enum_items
+
+    actions = []
+    for action_name, poses, interpolation, log_line in ANIMATIONS:
+        frames = np.array([p[0] for p in poses], dtype=np.float32)
+        values = np.zeros((len(bone_names) * 6, len(poses)), dtype=np.float32)
+        for col, (_frame, rots, locs) in enumerate(poses):
+            for bone, rot in rots.items():
+                values[row_of[bone]:row_of[bone] + 3, col] = np.radians(rot)
+            for bone, loc in locs.items():
+                values[row_of[bone] + 3:row_of[bone] + 6, col] = loc
+
+        action = bpy.data.actions.new(action_name)
+        arm_obj.animation_data.action = action
+        co = np.empty(len(poses) * 2, dtype=np.float32)
+        co[0::2] = frames
+        interp = [interp_ids[interpolation].value] * len(poses)
+        for b, name in enumerate(bone_names):
+            for c, prop in enumerate(("rotation_euler", "location")):
+                data_path = f'pose.bones["{name}"].{prop}'
+                for axis in range(3):
+                    fc = action.fcurves.new(data_path, index=axis, action_group=name)
+                    fc.keyframe_points.add(len(poses))
+                    co[1::2] = values[b * 6 + c * 3 + axis]
+                    fc.keyframe_points.foreach_set("co", co)
+                    fc.keyframe_points.foreach_set("interpolation", interp)
+                    fc.update()
+
+        action.use_fake_user = True
+        print(f"  {log_line}")
+        actions.append(action)
+    return actions
 
 
 # ──────────────────────────────────────────────
@@ -714,23 +575,22 @@ def main():
     clear_scene()
     create_materials()
 
-    # Build mesh groups
-    groups = build_body_parts()
+    with suspended_depsgraph_handlers():
+        # Build mesh groups
+        groups = build_body_parts()
 
-    # Create armature
-    arm_obj = create_armature()
+        # Create armature
+        arm_obj = create_armature()
 
-    # Rig: parent each mesh to its bone
-    rig_model(arm_obj, groups)
+        # Rig: parent each mesh to its bone
+        rig_model(arm_obj, groups)
 
     # Switch to pose mode for animation
     bpy.context.view_layer.objects.active = arm_obj
     bpy.ops.object.mode_set(mode='POSE')
 
     # Create animation clips
-    walk_action   = create_walk_cycle(arm_obj)
-    attack_action = create_attack_anim(arm_obj)
-    die_action    = create_die_anim(arm_obj)
+    walk_action, attack_action, die_action = build_all_animations(arm_obj)
 
     # Push each action onto its own NLA track so all export correctly
     anim_data = arm_obj.animation_data
@@ -17,101 +17,21 @@ Courtyard radius ~3.5, so the ~1.6 footprint leaves ample room.
 Blender coords: X=width (Unity X), Y=depth (Unity Z), Z=height (Unity Y).
 """
 
+import importlib
+import os
+import sys
+
 import bpy
 import math
 
-# ──────────────────────────────────────────────
-#  Utility helpers
-# ──────────────────────────────────────────────
-
-def clear_scene():
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for block in bpy.data.meshes:
-        if block.users == 0:
-            bpy.data.meshes.remove(block)
-    for block in bpy.data.armatures:
-        if block.users == 0:
-            bpy.data.armatures.remove(block)
-    for block in list(bpy.data.actions):
-        block.use_fake_user = False
-        bpy.data.actions.remove(block)
-    for block in bpy.data.materials:
-        if block.users == 0:
-            bpy.data.materials.remove(block)
-
-
-def make_material(name, color, emission=0.0, roughness=0.9, metallic=0.0):
-    mat = bpy.data.materials.new(name)
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get("Principled BSDF")
-    bsdf.inputs["Base Color"].default_value = color
-    bsdf.inputs["Roughness"].default_value = roughness
-    bsdf.inputs["Metallic"].default_value = metallic
-    if emission > 0:
-        bsdf.inputs["Emission Color"].default_value = color
-        bsdf.inputs["Emission Strength"].default_value = emission
-    return mat
-
-
-def add_cube(name, location, scale, material, rotation=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cube_add(size=1, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
-
-
-def add_cylinder(name, location, scale, material, rotation=(0, 0, 0), vertices=12):
-    bpy.ops.mesh.primitive_cylinder_add(vertices=vertices, radius=0.5, depth=1,
-                                         location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
-
-
-def bevel_object(obj, width=0.005, segments=1):
-    mod = obj.modifiers.new("Bevel", 'BEVEL')
-    mod.width = width
-    mod.segments = segments
-    mod.limit_method = 'ANGLE'
-    mod.angle_limit = math.radians(60)
-
-
-def apply_modifiers(obj):
-    bpy.context.view_layer.objects.active = obj
-    for mod in obj.modifiers[:]:
-        try:
-            bpy.ops.object.modifier_apply(modifier=mod.name)
-        except Exception:
-            pass
-
-
-def join_objects(objects, name):
-    if not objects:
-        return None
-    bpy.ops.object.select_all(action='DESELECT')
-    for o in objects:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objects[0]
-    bpy.ops.object.join()
-    result = bpy.context.active_object
-    result.name = name
-    return result
-
+# Shared helpers live next to this script (blender_build_utils.py); reload
+# it when already imported so edits show up without restarting Blender
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+if "blender_build_utils" in sys.modules:
+    importlib.reload(sys.modules["blender_build_utils"])
+from blender_build_utils import clear_scene, make_material, PrimitiveBatch
 
 # ──────────────────────────────────────────────
 #  Materials
@@ -151,7 +71,8 @@ def build_tower():
 
     Origin at base center (0, 0, 0).
     """
-    parts = []
+    # Nothing under 5 cm gets bevelled; at tower scale it's sub-pixel
+    batch = PrimitiveBatch(min_bevel_size=0.05)
 
     # ── DIMENSIONS ──
     BODY_S = 1.6     # main body side length
@@ -171,197 +92,138 @@ def build_tower():
     MERLON_TOP = 3.30
 
     # ── FOUNDATION ──
-    parts.append(add_cube("Foundation", (0, 0, FOUND_TOP / 2),
-                          (FOUND_S, FOUND_S, FOUND_TOP), MAT_STONE_DK))
-    bevel_object(parts[-1], 0.012)
+    batch.cube((0, 0, FOUND_TOP / 2),
+               (FOUND_S, FOUND_S, FOUND_TOP), MAT_STONE_DK, bevel=0.012)
 
     # ── MAIN BODY ──
     body_h = BODY_TOP - FOUND_TOP
-    parts.append(add_cube("Body", (0, 0, FOUND_TOP + body_h / 2),
-                          (BODY_S, BODY_S, body_h), MAT_STONE))
-    bevel_object(parts[-1], 0.008)
+    batch.cube((0, 0, FOUND_TOP + body_h / 2),
+               (BODY_S, BODY_S, body_h), MAT_STONE, bevel=0.008)
 
     # ── CORNER BUTTRESSES ──
     # Thicker pilasters at 4 corners for a sturdy look
     butt_w = 0.20
     butt_h = body_h * 0.65
-    for sx in [-1, 1]:
-        for sy in [-1, 1]:
-            bx = sx * (HB - butt_w / 2 + 0.025)
-            by = sy * (HB - butt_w / 2 + 0.025)
-            parts.append(add_cube(f"Buttress_{sx}_{sy}",
-                                  (bx, by, FOUND_TOP + butt_h / 2),
-                                  (butt_w, butt_w, butt_h), MAT_STONE_DK))
-            bevel_object(parts[-1], 0.006)
+    butt_off = HB - butt_w / 2 + 0.025
+    buttresses = [(sx * butt_off, sy * butt_off, FOUND_TOP + butt_h / 2,
+                   butt_w, butt_w, butt_h)
+                  for sx in (-1, 1) for sy in (-1, 1)]
+    batch.cubes(buttresses, MAT_STONE_DK, bevel=0.006)
+
+    # Every flush-to-the-wall detail below is an unrotated cube, so each
+    # group is collected as [x, y, z, sx, sy, sz] rows and emitted at once.
 
     # ── HORIZONTAL MORTAR COURSE LINES (all 4 faces) ──
     mortar_fracs = [0.25, 0.50, 0.75]
-    for i, frac in enumerate(mortar_fracs):
-        mz = FOUND_TOP + body_h * frac
+    mortar_zs = [FOUND_TOP + body_h * frac for frac in mortar_fracs]
+    mortar = [row for mz in mortar_zs for row in (
         # +/- X faces
-        for sx in [-1, 1]:
-            parts.append(add_cube(f"MortarX_{i}_{sx}",
-                                  (sx * (HB + 0.003), 0, mz),
-                                  (0.005, BODY_S - 0.06, 0.008), MAT_STONE_DK))
+        *[(sx * (HB + 0.003), 0, mz, 0.005, BODY_S - 0.06, 0.008) for sx in (-1, 1)],
         # +/- Y faces
-        for sy in [-1, 1]:
-            parts.append(add_cube(f"MortarY_{i}_{sy}",
-                                  (0, sy * (HB + 0.003), mz),
-                                  (BODY_S - 0.06, 0.005, 0.008), MAT_STONE_DK))
+        *[(0, sy * (HB + 0.003), mz, BODY_S - 0.06, 0.005, 0.008) for sy in (-1, 1)],
+    )]
+    batch.cubes(mortar, MAT_STONE_DK)
 
     # ── ARROW SLITS (lower row: 1 per face, mid-height) ──
     slit_z = FOUND_TOP + body_h * 0.40
-    for sx in [-1, 1]:
-        parts.append(add_cube(f"SlitX_{sx}",
-                              (sx * (HB + 0.005), 0, slit_z),
-                              (0.06, 0.04, 0.25), MAT_STONE_DK))
-    for sy in [-1, 1]:
-        parts.append(add_cube(f"SlitY_{sy}",
-                              (0, sy * (HB + 0.005), slit_z),
-                              (0.04, 0.06, 0.25), MAT_STONE_DK))
+    slits = ([(sx * (HB + 0.005), 0, slit_z, 0.06, 0.04, 0.25) for sx in (-1, 1)]
+             + [(0, sy * (HB + 0.005), slit_z, 0.04, 0.06, 0.25) for sy in (-1, 1)])
 
     # ── ARROW SLITS (upper row: 2 per face, flanking) ──
     slit_z2 = FOUND_TOP + body_h * 0.72
-    for sx in [-1, 1]:
-        for off in [-0.30, 0.30]:
-            parts.append(add_cube(f"Slit2X_{sx}_{off:.0f}",
-                                  (sx * (HB + 0.005), off, slit_z2),
-                                  (0.06, 0.035, 0.20), MAT_STONE_DK))
-    for sy in [-1, 1]:
-        for off in [-0.30, 0.30]:
-            parts.append(add_cube(f"Slit2Y_{sy}_{off:.0f}",
-                                  (off, sy * (HB + 0.005), slit_z2),
-                                  (0.035, 0.06, 0.20), MAT_STONE_DK))
+    slits += [(sx * (HB + 0.005), off, slit_z2, 0.06, 0.035, 0.20)
+              for sx in (-1, 1) for off in (-0.30, 0.30)]
+    slits += [(off, sy * (HB + 0.005), slit_z2, 0.035, 0.06, 0.20)
+              for sy in (-1, 1) for off in (-0.30, 0.30)]
+    batch.cubes(slits, MAT_STONE_DK)
 
     # ── IRON REINFORCEMENT BANDS (one ring at ~55% height) ──
     iron_z = FOUND_TOP + body_h * 0.55
-    for sx in [-1, 1]:
-        parts.append(add_cube(f"IronX_{sx}",
-                              (sx * (HB + 0.006), 0, iron_z),
-                              (0.015, BODY_S - 0.12, 0.03), MAT_IRON))
-    for sy in [-1, 1]:
-        parts.append(add_cube(f"IronY_{sy}",
-                              (0, sy * (HB + 0.006), iron_z),
-                              (BODY_S - 0.12, 0.015, 0.03), MAT_IRON))
+    iron = ([(sx * (HB + 0.006), 0, iron_z, 0.015, BODY_S - 0.12, 0.03) for sx in (-1, 1)]
+            + [(0, sy * (HB + 0.006), iron_z, BODY_S - 0.12, 0.015, 0.03) for sy in (-1, 1)])
 
     # Iron corner studs at band height
-    for sx in [-1, 1]:
-        for sy in [-1, 1]:
-            parts.append(add_cube(f"IronStud_{sx}_{sy}",
-                                  (sx * (HB + 0.012), sy * (HB + 0.012), iron_z),
-                                  (0.04, 0.04, 0.04), MAT_IRON))
+    iron += [(sx * (HB + 0.012), sy * (HB + 0.012), iron_z, 0.04, 0.04, 0.04)
+             for sx in (-1, 1) for sy in (-1, 1)]
 
     # ── SECOND IRON BAND (higher, near parapet) ──
     iron_z2 = BODY_TOP - 0.15
-    for sx in [-1, 1]:
-        parts.append(add_cube(f"Iron2X_{sx}",
-                              (sx * (HB + 0.006), 0, iron_z2),
-                              (0.015, BODY_S - 0.12, 0.025), MAT_IRON))
-    for sy in [-1, 1]:
-        parts.append(add_cube(f"Iron2Y_{sy}",
-                              (0, sy * (HB + 0.006), iron_z2),
-                              (BODY_S - 0.12, 0.015, 0.025), MAT_IRON))
+    iron += [(sx * (HB + 0.006), 0, iron_z2, 0.015, BODY_S - 0.12, 0.025) for sx in (-1, 1)]
+    iron += [(0, sy * (HB + 0.006), iron_z2, BODY_S - 0.12, 0.015, 0.025) for sy in (-1, 1)]
+    batch.cubes(iron, MAT_IRON)
 
     # ── CORBEL LEDGE (overhanging platform support) ──
     corbel_h = CORBEL_TOP - BODY_TOP
-    parts.append(add_cube("Corbel", (0, 0, BODY_TOP + corbel_h / 2),
-                          (CORBEL_S, CORBEL_S, corbel_h), MAT_STONE_LT))
-    bevel_object(parts[-1], 0.008)
+    batch.cube((0, 0, BODY_TOP + corbel_h / 2),
+               (CORBEL_S, CORBEL_S, corbel_h), MAT_STONE_LT, bevel=0.008)
 
     # ── PARAPET WALLS (4 walls forming a ring) ──
     pw_h = PARAPET_TOP - CORBEL_TOP
     pw_z = CORBEL_TOP + pw_h / 2
-    # -Y (south)
-    parts.append(add_cube("ParapetS", (0, -HC + WALL_T / 2, pw_z),
-                          (CORBEL_S, WALL_T, pw_h), MAT_STONE))
-    # +Y (north)
-    parts.append(add_cube("ParapetN", (0, HC - WALL_T / 2, pw_z),
-                          (CORBEL_S, WALL_T, pw_h), MAT_STONE))
-    # -X (west)
-    parts.append(add_cube("ParapetW", (-HC + WALL_T / 2, 0, pw_z),
-                          (WALL_T, CORBEL_S, pw_h), MAT_STONE))
-    # +X (east)
-    parts.append(add_cube("ParapetE", (HC - WALL_T / 2, 0, pw_z),
-                          (WALL_T, CORBEL_S, pw_h), MAT_STONE))
+    batch.cubes([
+        (0, -HC + WALL_T / 2, pw_z, CORBEL_S, WALL_T, pw_h),   # -Y (south)
+        (0,  HC - WALL_T / 2, pw_z, CORBEL_S, WALL_T, pw_h),   # +Y (north)
+        (-HC + WALL_T / 2, 0, pw_z, WALL_T, CORBEL_S, pw_h),   # -X (west)
+        ( HC - WALL_T / 2, 0, pw_z, WALL_T, CORBEL_S, pw_h),   # +X (east)
+    ], MAT_STONE)
 
     # ── CRENELLATIONS (3 merlons per side) ──
     merlon_h = MERLON_TOP - PARAPET_TOP
     merlon_w = 0.30
     merlon_xs = [-0.55, 0, 0.55]
-
-    # Helper to add a merlon + cap on a given face
-    def add_merlons_on_face(label, fixed_axis, fixed_val, vary_axis, positions):
-        for pos in positions:
-            if fixed_axis == 'y':
-                loc = (pos, fixed_val, PARAPET_TOP + merlon_h / 2)
-                sz = (merlon_w, WALL_T + 0.02, merlon_h)
-                cap_sz = (merlon_w + 0.03, WALL_T + 0.04, 0.02)
-            else:
-                loc = (fixed_val, pos, PARAPET_TOP + merlon_h / 2)
-                sz = (WALL_T + 0.02, merlon_w, merlon_h)
-                cap_sz = (WALL_T + 0.04, merlon_w + 0.03, 0.02)
-
-            cap_loc = (loc[0], loc[1], MERLON_TOP + 0.01)
-
-            parts.append(add_cube(f"M{label}_{pos:.2f}", loc, sz, MAT_STONE))
-            bevel_object(parts[-1], 0.004)
-            parts.append(add_cube(f"MC{label}_{pos:.2f}", cap_loc, cap_sz, MAT_STONE_LT))
-
-    add_merlons_on_face("S", 'y', -HC + WALL_T / 2, 'x', merlon_xs)
-    add_merlons_on_face("N", 'y',  HC - WALL_T / 2, 'x', merlon_xs)
-    add_merlons_on_face("W", 'x', -HC + WALL_T / 2, 'y', merlon_xs)
-    add_merlons_on_face("E", 'x',  HC - WALL_T / 2, 'y', merlon_xs)
+    wall_mid = HC - WALL_T / 2
+    # (x, y) of every merlon: S and N faces run along X, W and E along Y
+    ns_xy = [(pos, fy) for fy in (-wall_mid, wall_mid) for pos in merlon_xs]
+    we_xy = [(fx, pos) for fx in (-wall_mid, wall_mid) for pos in merlon_xs]
+    merlons = ([(x, y, PARAPET_TOP + merlon_h / 2, merlon_w, WALL_T + 0.02, merlon_h)
+                for x, y in ns_xy]
+               + [(x, y, PARAPET_TOP + merlon_h / 2, WALL_T + 0.02, merlon_w, merlon_h)
+                  for x, y in we_xy])
+    merlon_caps = ([(x, y, MERLON_TOP + 0.01, merlon_w + 0.03, WALL_T + 0.04, 0.02)
+                    for x, y in ns_xy]
+                   + [(x, y, MERLON_TOP + 0.01, WALL_T + 0.04, merlon_w + 0.03, 0.02)
+                      for x, y in we_xy])
+    batch.cubes(merlons, MAT_STONE, bevel=0.004)
+    batch.cubes(merlon_caps, MAT_STONE_LT)
 
     # ── CORNER TURRET POSTS (raised at 4 parapet corners) ──
     turret_s = 0.22
     turret_h = merlon_h + 0.10
-    for sx in [-1, 1]:
-        for sy in [-1, 1]:
-            cx = sx * (HC - turret_s / 2)
-            cy = sy * (HC - turret_s / 2)
-            parts.append(add_cube(f"Turret_{sx}_{sy}",
-                                  (cx, cy, PARAPET_TOP + turret_h / 2),
-                                  (turret_s, turret_s, turret_h), MAT_STONE_DK))
-            bevel_object(parts[-1], 0.005)
-            # Turret cap slab
-            parts.append(add_cube(f"TurretCap_{sx}_{sy}",
-                                  (cx, cy, PARAPET_TOP + turret_h + 0.012),
-                                  (turret_s + 0.04, turret_s + 0.04, 0.025),
-                                  MAT_STONE_LT))
+    turret_off = HC - turret_s / 2
+    corners = [(sx * turret_off, sy * turret_off) for sx in (-1, 1) for sy in (-1, 1)]
+    turrets = [(cx, cy, PARAPET_TOP + turret_h / 2, turret_s, turret_s, turret_h)
+               for cx, cy in corners]
+    # Turret cap slabs
+    turret_caps = [(cx, cy, PARAPET_TOP + turret_h + 0.012,
+                    turret_s + 0.04, turret_s + 0.04, 0.025)
+                   for cx, cy in corners]
+    batch.cubes(turrets, MAT_STONE_DK, bevel=0.005)
+    batch.cubes(turret_caps, MAT_STONE_LT)
 
     # ── ENTRANCE DOORWAY (-Y face / south) ──
     arch_w = 0.45
     arch_h = 0.65
     arch_z = FOUND_TOP + arch_h / 2
     # Dark recess behind the door
-    parts.append(add_cube("DoorRecess", (0, -HB - 0.002, arch_z),
-                          (arch_w, 0.08, arch_h), MAT_STONE_DK))
+    batch.cube((0, -HB - 0.002, arch_z),
+               (arch_w, 0.08, arch_h), MAT_STONE_DK)
     # Wooden door planks
-    parts.append(add_cube("Door", (0, -HB - 0.015, arch_z),
-                          (arch_w - 0.06, 0.06, arch_h - 0.05), MAT_WOOD))
+    batch.cube((0, -HB - 0.015, arch_z),
+               (arch_w - 0.06, 0.06, arch_h - 0.05), MAT_WOOD)
     # Stone lintel above door
-    parts.append(add_cube("Lintel", (0, -HB - 0.01, FOUND_TOP + arch_h + 0.04),
-                          (arch_w + 0.10, 0.10, 0.07), MAT_STONE_LT))
-    bevel_object(parts[-1], 0.005)
-    # Iron door bands
-    for dz in [0.18, 0.40]:
-        parts.append(add_cube(f"DoorBand_{dz:.2f}",
-                              (0, -HB - 0.028, FOUND_TOP + dz),
-                              (arch_w - 0.08, 0.02, 0.03), MAT_IRON))
-    # Iron door ring handle
-    parts.append(add_cube("DoorRing", (0, -HB - 0.035, FOUND_TOP + 0.30),
-                          (0.06, 0.02, 0.06), MAT_IRON))
-
-    # ── APPLY AND JOIN ──
-    for p in parts:
-        apply_modifiers(p)
-
-    tower = join_objects(parts, "Tower")
-
-    # Set origin at base center (ground level)
-    bpy.context.view_layer.objects.active = tower
-    bpy.context.scene.cursor.location = (0, 0, 0)
-    bpy.ops.object.origin_set(type='ORIGIN_CURSOR')
+    batch.cube((0, -HB - 0.01, FOUND_TOP + arch_h + 0.04),
+               (arch_w + 0.10, 0.10, 0.07), MAT_STONE_LT, bevel=0.005)
+    # Iron door bands + ring handle
+    door_iron = [(0, -HB - 0.028, FOUND_TOP + dz, arch_w - 0.08, 0.02, 0.03)
+                 for dz in (0.18, 0.40)]
+    door_iron.append((0, -HB - 0.035, FOUND_TOP + 0.30, 0.06, 0.02, 0.06))
+    batch.cubes(door_iron, MAT_IRON)
+
+    # ── BUILD SINGLE MESH ──
+    tower = batch.build("Tower")
+
+    # Origin at base center (ground level): parts are already placed
+    # relative to it, so the object only has to sit at the world origin
     tower.location = (0, 0, 0)
 
     return tower
@@ -8,101 +8,22 @@ Metal bands and clasp on the chest body. Sized to ~0.3 units total.
 The game script already rotates the pickup on Y, so no animation needed.
 """
 
+import importlib
+import os
+import sys
+
 import bpy
 import math
+import numpy as np
 
-# ──────────────────────────────────────────────
-#  Utility helpers
-# ──────────────────────────────────────────────
-
-def clear_scene():
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for block in bpy.data.meshes:
-        if block.users == 0:
-            bpy.data.meshes.remove(block)
-    for block in bpy.data.armatures:
-        if block.users == 0:
-            bpy.data.armatures.remove(block)
-    for block in list(bpy.data.actions):
-        block.use_fake_user = False
-        bpy.data.actions.remove(block)
-    for block in bpy.data.materials:
-        if block.users == 0:
-            bpy.data.materials.remove(block)
-
-
-def make_material(name, color, emission=0.0, roughness=0.9, metallic=0.0):
-    mat = bpy.data.materials.new(name)
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get("Principled BSDF")
-    bsdf.inputs["Base Color"].default_value = color
-    bsdf.inputs["Roughness"].default_value = roughness
-    bsdf.inputs["Metallic"].default_value = metallic
-    if emission > 0:
-        bsdf.inputs["Emission Color"].default_value = color
-        bsdf.inputs["Emission Strength"].default_value = emission
-    return mat
-
-
-def add_cube(name, location, scale, material, rotation=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cube_add(size=1, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
-
-
-def add_cylinder(name, location, scale, material, rotation=(0, 0, 0), vertices=12):
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=vertices, radius=0.5, depth=1.0,
-        location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
-
-
-def bevel_object(obj, width=0.005, segments=1):
-    mod = obj.modifiers.new("Bevel", 'BEVEL')
-    mod.width = width
-    mod.segments = segments
-    mod.limit_method = 'ANGLE'
-    mod.angle_limit = math.radians(60)
-
-
-def apply_modifiers(obj):
-    bpy.context.view_layer.objects.active = obj
-    for mod in obj.modifiers[:]:
-        try:
-            bpy.ops.object.modifier_apply(modifier=mod.name)
-        except Exception:
-            pass
-
-
-def join_objects(objects, name):
-    bpy.ops.object.select_all(action='DESELECT')
-    for o in objects:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objects[0]
-    bpy.ops.object.join()
-    result = bpy.context.active_object
-    result.name = name
-    return result
-
+# Shared helpers live next to this script (blender_build_utils.py); reload
+# it when already imported so edits show up without restarting Blender
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+if "blender_build_utils" in sys.modules:
+    importlib.reload(sys.modules["blender_build_utils"])
+from blender_build_utils import clear_scene, make_material, PrimitiveBatch
 
 # ──────────────────────────────────────────────
 #  Materials
@@ -125,6 +46,70 @@ def create_materials():
     MAT_LINING  = make_material("TreasureLining", (0.50, 0.10, 0.08, 1.0))
 
 
+# ──────────────────────────────────────────────
+#  Part table
+# ──────────────────────────────────────────────
+
+# Material slots used by CHEST_CUBES (resolved after create_materials)
+WOOD, WOOD_DK, GOLD, METAL, LINING = range(5)
+
+# The lid pivots from the back edge of the chest (top of the walls),
+# tilted back ~50° from vertical
+LID_PIVOT_Y = 0.045
+LID_PIVOT_Z = 0.09
+LID_ROT = (math.radians(-50), 0, 0)
+
+CHEST_CUBES = np.array([
+    #  location                                      scale                  rotation   material bevel
+    # ── CHEST BODY (box shape, open top) ──
+    ((0, 0, 0.02),                                   (0.14, 0.10, 0.02),    (0, 0, 0), WOOD,    0.003),  # Bottom
+    ((0, -0.045, 0.06),                              (0.14, 0.015, 0.06),   (0, 0, 0), WOOD,    0.003),  # Front wall
+    ((0, 0.045, 0.06),                               (0.14, 0.015, 0.06),   (0, 0, 0), WOOD,    0.003),  # Back wall
+    ((-0.065, 0, 0.06),                              (0.015, 0.10, 0.06),   (0, 0, 0), WOOD,    0.003),  # Left wall
+    ((0.065, 0, 0.06),                               (0.015, 0.10, 0.06),   (0, 0, 0), WOOD,    0.003),  # Right wall
+    # ── LINING (inside walls — red velvet visible from top) ──
+    ((0, 0, 0.06),                                   (0.11, 0.07, 0.055),   (0, 0, 0), LINING,  0.0),
+    # ── METAL BANDS (iron straps around chest body) ──
+    ((0, -0.048, 0.06),                              (0.15, 0.005, 0.065),  (0, 0, 0), METAL,   0.0),    # Front band
+    ((0, 0.048, 0.06),                               (0.15, 0.005, 0.065),  (0, 0, 0), METAL,   0.0),    # Back band
+    ((-0.068, 0, 0.06),                              (0.005, 0.105, 0.065), (0, 0, 0), METAL,   0.0),    # Side band left
+    ((0.068, 0, 0.06),                               (0.005, 0.105, 0.065), (0, 0, 0), METAL,   0.0),    # Side band right
+    # Bottom corner reinforcements
+    ((-0.065, -0.045, 0.015),                        (0.02, 0.02, 0.02),    (0, 0, 0), METAL,   0.0),
+    ((0.065, -0.045, 0.015),                         (0.02, 0.02, 0.02),    (0, 0, 0), METAL,   0.0),
+    ((-0.065, 0.045, 0.015),                         (0.02, 0.02, 0.02),    (0, 0, 0), METAL,   0.0),
+    ((0.065, 0.045, 0.015),                          (0.02, 0.02, 0.02),    (0, 0, 0), METAL,   0.0),
+    # ── CLASP (front lock piece) ──
+    ((0, -0.055, 0.06),                              (0.03, 0.01, 0.03),    (0, 0, 0), METAL,   0.002),
+    ((0, -0.062, 0.06),                              (0.008, 0.005, 0.012), (0, 0, 0), WOOD_DK, 0.0),    # Keyhole
+    # ── LID (open, tilted back) ──
+    ((0, LID_PIVOT_Y + 0.04, LID_PIVOT_Z + 0.04),    (0.14, 0.015, 0.10),   LID_ROT,   WOOD,    0.003),  # Lid panel
+    # Lid top (slightly arched / thicker top surface)
+    ((0, LID_PIVOT_Y + 0.045, LID_PIVOT_Z + 0.05),   (0.13, 0.02, 0.08),    LID_ROT,   WOOD_DK, 0.004),
+    ((0, LID_PIVOT_Y + 0.042, LID_PIVOT_Z + 0.04),   (0.15, 0.005, 0.105),  LID_ROT,   METAL,   0.0),    # Metal band on lid
+    ((-0.05, 0.050, LID_PIVOT_Z),                    (0.015, 0.015, 0.01),  (0, 0, 0), METAL,   0.0),    # Hinge left
+    ((0.05, 0.050, LID_PIVOT_Z),                     (0.015, 0.015, 0.01),  (0, 0, 0), METAL,   0.0),    # Hinge right
+], dtype=[('loc', '3f4'), ('scale', '3f4'), ('rot', '3f4'), ('mat', 'i4'), ('bevel', 'f8')])
+
+
+# Gold coins piled inside the chest (flat 10-sided cylinders)
+COIN_SCALE = (0.025, 0.025, 0.008)
+COIN_LOCATIONS = np.array([
+    # Bottom layer
+    (0, 0, 0.045), (-0.03, -0.01, 0.045), (0.03, -0.01, 0.045),
+    (-0.02, 0.02, 0.045), (0.02, 0.02, 0.045),
+    # Middle layer — slightly offset, stacked
+    (-0.015, -0.005, 0.055), (0.015, 0.005, 0.055),
+    (0.0, 0.015, 0.055), (-0.03, 0.01, 0.055),
+    # Top coins — tilted at angles for visual interest
+    (0.01, -0.01, 0.065), (-0.02, 0.005, 0.065),
+    # Leaning against the edge (partially visible)
+    (0.04, 0, 0.06), (-0.04, -0.01, 0.055),
+])
+COIN_ROTATIONS_DEG = np.zeros_like(COIN_LOCATIONS)
+COIN_ROTATIONS_DEG[9:] = [(15, 0, 10), (-10, 20, 0), (0, 60, 0), (0, -55, 10)]
+
+
 # ──────────────────────────────────────────────
 #  Build the treasure chest
 # ──────────────────────────────────────────────
@@ -133,155 +118,39 @@ def build_treasure():
     """Build a small open treasure chest with gold coins.
     Model centered at origin, roughly 0.3 units wide/deep, 0.25 tall.
     Origin at base so it sits on the ground plane."""
-    parts = []
+    batch = PrimitiveBatch()
 
     # Scale factor — the whole model should be about 0.3 units across
     # We'll build at a comfortable size then it gets imported at correct scale
     # Building at roughly 0.15 half-width
 
-    # ── CHEST BODY (box shape, open top) ──
-    # Bottom
-    parts.append(add_cube("ChestBottom", (0, 0, 0.02),
-                          (0.14, 0.10, 0.02), MAT_WOOD))
-    bevel_object(parts[-1], 0.003)
-    # Front wall
-    parts.append(add_cube("ChestFront", (0, -0.045, 0.06),
-                          (0.14, 0.015, 0.06), MAT_WOOD))
-    bevel_object(parts[-1], 0.003)
-    # Back wall
-    parts.append(add_cube("ChestBack", (0, 0.045, 0.06),
-                          (0.14, 0.015, 0.06), MAT_WOOD))
-    bevel_object(parts[-1], 0.003)
-    # Left wall
-    parts.append(add_cube("ChestLeft", (-0.065, 0, 0.06),
-                          (0.015, 0.10, 0.06), MAT_WOOD))
-    bevel_object(parts[-1], 0.003)
-    # Right wall
-    parts.append(add_cube("ChestRight", (0.065, 0, 0.06),
-                          (0.015, 0.10, 0.06), MAT_WOOD))
-    bevel_object(parts[-1], 0.003)
-
-    # ── LINING (inside walls — red velvet visible from top) ──
-    parts.append(add_cube("Lining", (0, 0, 0.06),
-                          (0.11, 0.07, 0.055), MAT_LINING))
-
-    # ── METAL BANDS (iron straps around chest body) ──
-    # Front band
-    parts.append(add_cube("BandFront", (0, -0.048, 0.06),
-                          (0.15, 0.005, 0.065), MAT_METAL))
-    # Back band
-    parts.append(add_cube("BandBack", (0, 0.048, 0.06),
-                          (0.15, 0.005, 0.065), MAT_METAL))
-    # Side band left
-    parts.append(add_cube("BandLeft", (-0.068, 0, 0.06),
-                          (0.005, 0.105, 0.065), MAT_METAL))
-    # Side band right
-    parts.append(add_cube("BandRight", (0.068, 0, 0.06),
-                          (0.005, 0.105, 0.065), MAT_METAL))
-    # Bottom corner reinforcements
-    parts.append(add_cube("CornerFL", (-0.065, -0.045, 0.015),
-                          (0.02, 0.02, 0.02), MAT_METAL))
-    parts.append(add_cube("CornerFR", (0.065, -0.045, 0.015),
-                          (0.02, 0.02, 0.02), MAT_METAL))
-    parts.append(add_cube("CornerBL", (-0.065, 0.045, 0.015),
-                          (0.02, 0.02, 0.02), MAT_METAL))
-    parts.append(add_cube("CornerBR", (0.065, 0.045, 0.015),
-                          (0.02, 0.02, 0.02), MAT_METAL))
-
-    # ── CLASP (front lock piece) ──
-    parts.append(add_cube("Clasp", (0, -0.055, 0.06),
-                          (0.03, 0.01, 0.03), MAT_METAL))
-    bevel_object(parts[-1], 0.002)
-    # Keyhole
-    parts.append(add_cube("Keyhole", (0, -0.062, 0.06),
-                          (0.008, 0.005, 0.012), MAT_WOOD_DK))
-
-    # ── LID (open, tilted back ~60°) ──
-    # The lid pivots from the back edge of the chest
-    # Lid at ~60° open angle from vertical
-    lid_pivot_y = 0.045   # back edge
-    lid_pivot_z = 0.09    # top of chest walls
-    lid_angle = math.radians(-50)  # tilted back
-
-    # Lid panel
-    parts.append(add_cube("LidPanel", (0, lid_pivot_y + 0.04, lid_pivot_z + 0.04),
-                          (0.14, 0.015, 0.10), MAT_WOOD,
-                          rotation=(lid_angle, 0, 0)))
-    bevel_object(parts[-1], 0.003)
-    # Lid top (slightly arched / thicker top surface)
-    parts.append(add_cube("LidTop", (0, lid_pivot_y + 0.045, lid_pivot_z + 0.05),
-                          (0.13, 0.02, 0.08), MAT_WOOD_DK,
-                          rotation=(lid_angle, 0, 0)))
-    bevel_object(parts[-1], 0.004)
-    # Metal band on lid
-    parts.append(add_cube("LidBand", (0, lid_pivot_y + 0.042, lid_pivot_z + 0.04),
-                          (0.15, 0.005, 0.105), MAT_METAL,
-                          rotation=(lid_angle, 0, 0)))
-    # Hinge left
-    parts.append(add_cube("HingeL", (-0.05, 0.050, lid_pivot_z),
-                          (0.015, 0.015, 0.01), MAT_METAL))
-    # Hinge right
-    parts.append(add_cube("HingeR", (0.05, 0.050, lid_pivot_z),
-                          (0.015, 0.015, 0.01), MAT_METAL))
+    # All box parts come from CHEST_CUBES, emitted as one vectorized
+    # group per (material, bevel) pair
+    materials = (MAT_WOOD, MAT_WOOD_DK, MAT_GOLD, MAT_METAL, MAT_LINING)
+    groups = dict.fromkeys(zip(CHEST_CUBES['mat'].tolist(), CHEST_CUBES['bevel'].tolist()))
+    for mat, bevel in groups:
+        rows = CHEST_CUBES[(CHEST_CUBES['mat'] == mat) & (CHEST_CUBES['bevel'] == bevel)]
+        batch.cubes(np.hstack([rows['loc'], rows['scale']]), materials[mat],
+                    bevel=bevel, rotations=rows['rot'])
 
     # ── GOLD COINS (piled inside chest, visible from above) ──
-    # Bottom layer of coins (flat cylinders)
-    coin_z = 0.045
-    coin_positions = [
-        (0, 0, coin_z),
-        (-0.03, -0.01, coin_z),
-        (0.03, -0.01, coin_z),
-        (-0.02, 0.02, coin_z),
-        (0.02, 0.02, coin_z),
-    ]
-    for i, pos in enumerate(coin_positions):
-        parts.append(add_cylinder(f"CoinBase{i}", pos,
-                                  (0.025, 0.025, 0.008), MAT_GOLD,
-                                  vertices=10))
-
-    # Middle layer — slightly offset, stacked
-    coin_z2 = 0.055
-    coin_positions2 = [
-        (-0.015, -0.005, coin_z2),
-        (0.015, 0.005, coin_z2),
-        (0.0, 0.015, coin_z2),
-        (-0.03, 0.01, coin_z2),
-    ]
-    for i, pos in enumerate(coin_positions2):
-        parts.append(add_cylinder(f"CoinMid{i}", pos,
-                                  (0.025, 0.025, 0.008), MAT_GOLD,
-                                  vertices=10))
-
-    # Top coins — some tilted at angles for visual interest
-    parts.append(add_cylinder("CoinTop0", (0.01, -0.01, 0.065),
-                              (0.025, 0.025, 0.008), MAT_GOLD,
-                              rotation=(math.radians(15), 0, math.radians(10)),
-                              vertices=10))
-    parts.append(add_cylinder("CoinTop1", (-0.02, 0.005, 0.065),
-                              (0.025, 0.025, 0.008), MAT_GOLD,
-                              rotation=(math.radians(-10), math.radians(20), 0),
-                              vertices=10))
-    # A few coins leaning against the edge (partially visible)
-    parts.append(add_cylinder("CoinLean0", (0.04, 0, 0.06),
-                              (0.025, 0.025, 0.008), MAT_GOLD,
-                              rotation=(0, math.radians(60), 0),
-                              vertices=10))
-    parts.append(add_cylinder("CoinLean1", (-0.04, -0.01, 0.055),
-                              (0.025, 0.025, 0.008), MAT_GOLD,
-                              rotation=(0, math.radians(-55), math.radians(10)),
-                              vertices=10))
-
-    # Apply all modifiers
-    for p in parts:
-        apply_modifiers(p)
-
-    # Join everything into one mesh
-    chest = join_objects(parts, "TreasureChest")
-
-    # Set origin to the base center
-    bpy.context.view_layer.objects.active = chest
-    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='BOUNDS')
-    # Move origin to bottom center
+    # Every coin is the same 10-sided cylinder, so they go in as one
+    # instanced group
+    batch.cylinders(COIN_LOCATIONS, COIN_SCALE, MAT_GOLD,
+                    rotations=np.radians(COIN_ROTATIONS_DEG), vertices=10)
+
+    # Write everything into one mesh
+    chest = batch.build("TreasureChest")
+
+    # Centre the mesh bounds on the object origin (what origin_set with
+    # ORIGIN_GEOMETRY/BOUNDS did) by shifting the vertex data in place
+    me = chest.data
+    co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+    me.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    co -= 0.5 * (co.min(axis=0) + co.max(axis=0))
+    me.vertices.foreach_set("co", co.ravel())
+    me.update()
     chest.location = (0, 0, 0)
 
     return chest
@@ -19,9 +19,25 @@ The model uses rigid-body bone parenting (no mesh deformation) —
 each body part moves as a solid block, matching the art style.
 """
 
+import importlib
+import os
+import sys
+
 import bpy
 import math
-from mathutils import Vector, Euler
+import numpy as np
+from mathutils import Vector, Euler, Matrix
+
+# Material, primitive and bevel helpers are shared with the prop
+# generators (blender_build_utils.py, next to this script)
+_HERE = os.path.dirname(os.path.abspath(__file__))
+if _HERE not in sys.path:
+    sys.path.insert(0, _HERE)
+if "blender_build_utils" in sys.modules:
+    importlib.reload(sys.modules["blender_build_utils"])
+from blender_build_utils import (_bevel_by_class, _bsdf_input, _material_template,
+                                 _template, _unit_cone, _unit_cube, _unit_cylinder,
+                                 commit_mesh)
 
 # ──────────────────────────────────────────────
 #  Utility helpers
@@ -29,127 +45,191 @@ from mathutils import Vector, Euler
 
 def clear_scene():
     """Remove everything, including fake-user actions from prior runs."""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for block in bpy.data.meshes:
-        if block.users == 0:
-            bpy.data.meshes.remove(block)
-    for block in bpy.data.armatures:
-        if block.users == 0:
-            bpy.data.armatures.remove(block)
-    for block in list(bpy.data.actions):
+    for block in bpy.data.actions:
         block.use_fake_user = False
-        bpy.data.actions.remove(block)
-    for block in bpy.data.materials:
-        if block.users == 0:
-            bpy.data.materials.remove(block)
+    # One batch_remove per pass instead of a remove() per datablock.
+    # Meshes/armatures only orphan once their objects are gone, and
+    # materials once their meshes are, hence three passes.
+    bpy.data.batch_remove(ids=list(bpy.data.objects) + list(bpy.data.actions))
+    bpy.data.batch_remove(ids=[b for b in (*bpy.data.meshes, *bpy.data.armatures)
+                               if b.users == 0])
+    bpy.data.batch_remove(ids=[m for m in bpy.data.materials if m.users == 0])
+    # The shared part meshes were orphaned and removed above
+    _MESH_CACHE.clear()
 
 
 def make_material(name, color, emission=0.0, roughness=0.9):
     """Create a simple Principled BSDF material."""
-    mat = bpy.data.materials.new(name)
-    mat.use_nodes = True
+    mat = _material_template().copy()
+    mat.name = name
     bsdf = mat.node_tree.nodes.get("Principled BSDF")
-    bsdf.inputs["Base Color"].default_value = color
-    bsdf.inputs["Roughness"].default_value = roughness
+    _bsdf_input(bsdf, "Base Color").default_value = color
+    _bsdf_input(bsdf, "Roughness").default_value = roughness
     if emission > 0:
-        bsdf.inputs["Emission Color"].default_value = color
-        bsdf.inputs["Emission Strength"].default_value = emission
+        _bsdf_input(bsdf, "Emission Color").default_value = color
+        _bsdf_input(bsdf, "Emission Strength").default_value = emission
     return mat
 
 
+def _rot_scale(scale, rotation):
+    """Rotation (XYZ Euler) · scale as a 3x3 numpy matrix — what
+    transform_apply(rotation=True, scale=True) bakes into the vertices."""
+    cx, cy, cz = np.cos(rotation)
+    sx, sy, sz = np.sin(rotation)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return (rz @ ry @ rx) * np.asarray(scale, dtype=np.float64)
+
+
+# Part meshes with rotation/scale already baked in, by (primitive,
+# material, scale, rotation); mirrored and repeated parts share one
+_MESH_CACHE = {}
+
+
+def _shared_mesh(key, template, material, scale, rotation):
+    cache_key = (key, material, tuple(scale), tuple(rotation))
+    me = _MESH_CACHE.get(cache_key)
+    if me is None:
+        verts, loop_vidx, loop_totals = template
+        baked = (verts @ _rot_scale(scale, rotation).T).astype(np.float32)
+        me = commit_mesh(f"{key}_{material.name}", baked,
+                         np.cumsum(loop_totals, dtype=np.int32) - loop_totals,
+                         loop_vidx, np.zeros(len(loop_totals), dtype=np.int32),
+                         [material])
+        _MESH_CACHE[cache_key] = me
+    return me
+
+
+def _build_collection():
+    """Staging collection the joined groups live in until build_body_parts
+    is done.  It is never linked into the scene, so the groups reach it in
+    one go at the end."""
+    coll = bpy.data.collections.get("_TrollBuild")
+    if coll is None:
+        coll = bpy.data.collections.new("_TrollBuild")
+    return coll
+
+
+class _Part:
+    """A part waiting to be joined: its (shared) mesh, its location and the
+    bevel width bevel_object asked for.  Parts never become objects —
+    join_objects writes each group's mesh straight from them."""
+    __slots__ = ("name", "data", "location", "bevel")
+
+    def __init__(self, name, data, location):
+        self.name = name
+        self.data = data
+        self.location = location
+        self.bevel = 0.0
+
+
+def _add_mesh_fast(name, key, template, location, scale, rotation, material):
+    """Create a part from its shared mesh.  Rotation and scale are baked
+    into that mesh in numpy, as transform_apply did, so the part itself
+    only carries its location."""
+    return _Part(name, _shared_mesh(key, template, material, scale, rotation),
+                 location)
+
+
 def add_cube(name, location, scale, material, rotation=(0, 0, 0)):
-    """Add a cube, apply rotation+scale, assign material."""
-    bpy.ops.mesh.primitive_cube_add(size=1, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
+    """Add a cube with scale/rotation, assign material."""
+    return _add_mesh_fast(name, "Cube", _template(_unit_cube),
+                          location, scale, rotation, material)
 
 
 def add_wedge(name, location, scale, material, rotation=(0, 0, 0)):
     """Create a 4-sided cone (wedge) for ears/fangs."""
-    bpy.ops.mesh.primitive_cone_add(
-        vertices=4, radius1=0.5, radius2=0.0, depth=1.0,
-        location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
+    return _add_mesh_fast(name, "Wedge", _template(_unit_cone, 4),
+                          location, scale, rotation, material)
 
 
 def add_cylinder(name, location, scale, material, rotation=(0, 0, 0), vertices=8):
-    """Add a cylinder, apply rotation+scale, assign material."""
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=vertices, radius=0.5, depth=1.0,
-        location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
-
-
-def bevel_object(obj, width=0.02, segments=1):
-    """Add a subtle bevel modifier."""
-    mod = obj.modifiers.new("Bevel", 'BEVEL')
-    mod.width = width
-    mod.segments = segments
-    mod.limit_method = 'ANGLE'
-    mod.angle_limit = math.radians(60)
-
-
-def apply_modifiers(obj):
-    """Apply all modifiers on an object."""
-    bpy.context.view_layer.objects.active = obj
-    for mod in obj.modifiers[:]:
-        try:
-            bpy.ops.object.modifier_apply(modifier=mod.name)
-        except Exception:
-            pass
-
-
-def join_objects(objects, name):
-    """Join a list of objects into one, return the result."""
-    bpy.ops.object.select_all(action='DESELECT')
-    for o in objects:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objects[0]
-    bpy.ops.object.join()
-    result = bpy.context.active_object
-    result.name = name
+    """Add a cylinder with scale/rotation, assign material."""
+    return _add_mesh_fast(name, f"Cylinder{vertices}",
+                          _template(_unit_cylinder, vertices),
+                          location, scale, rotation, material)
+
+
+def bevel_object(part, width=0.02):
+    """Mark the part for a subtle bevel (1 segment, ANGLE limit 60°, as the
+    Bevel modifier had).  join_objects bakes it, one pass per width."""
+    part.bevel = width
+
+
+def join_objects(parts, name):
+    """Write the parts into one new mesh object with numpy + foreach_set —
+    no per-part objects and no bpy.ops.object.join.  Like join, the result
+    sits at the first part's location; parts only carry a location, so each
+    one's vertices just shift by their offset from it.  Requested bevels
+    are baked into the joined mesh, one pass per distinct width."""
+    base = np.array(parts[0].location)
+    materials = []
+    cos, vidxs, totals, mat_ids, classes = [], [], [], [], []
+    widths = {}
+    v_off = 0
+    for p in parts:
+        me = p.data
+        nv, nl, npoly = len(me.vertices), len(me.loops), len(me.polygons)
+        co = np.empty(nv * 3, dtype=np.float32)
+        me.vertices.foreach_get("co", co)
+        vidx = np.empty(nl, dtype=np.int32)
+        me.loops.foreach_get("vertex_index", vidx)
+        starts = np.empty(npoly, dtype=np.int32)
+        me.polygons.foreach_get("loop_start", starts)
+        sizes = np.empty(npoly, dtype=np.int32)
+        me.polygons.foreach_get("loop_total", sizes)
+        mi = np.empty(npoly, dtype=np.int32)
+        me.polygons.foreach_get("material_index", mi)
+
+        # Into the first part's space; loops re-laid out in polygon order
+        cos.append(co.reshape(-1, 3) + (np.array(p.location) - base))
+        packed = np.cumsum(sizes) - sizes
+        vidxs.append(vidx[np.repeat(starts - packed, sizes) + np.arange(nl)] + v_off)
+        totals.append(sizes)
+        slots = []
+        for mat in me.materials:
+            if mat not in materials:
+                materials.append(mat)
+            slots.append(materials.index(mat))
+        mat_ids.append(np.array(slots, dtype=np.int32)[mi])
+        cls = widths.setdefault(p.bevel, len(widths) + 1) if p.bevel else 0
+        classes.append(np.full(npoly, cls, dtype=np.int32))
+        v_off += nv
+
+    co = np.concatenate(cos).astype(np.float32)
+    vidx = np.concatenate(vidxs)
+    sizes = np.concatenate(totals)
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(co))
+    mesh.vertices.foreach_set("co", co.ravel())
+    mesh.loops.add(len(vidx))
+    mesh.loops.foreach_set("vertex_index", vidx)
+    mesh.polygons.add(len(sizes))
+    mesh.polygons.foreach_set("loop_start", np.cumsum(sizes, dtype=np.int32) - sizes)
+    mesh.polygons.foreach_set("material_index", np.concatenate(mat_ids))
+    for mat in materials:
+        mesh.materials.append(mat)
+    mesh.update(calc_edges=True)
+    if widths:
+        _bevel_by_class(mesh, list(widths), np.concatenate(classes))
+
+    result = bpy.data.objects.new(name, mesh)
+    _build_collection().objects.link(result)
+    result.location = parts[0].location
     return result
 
 
 def parent_to_bone(obj, armature, bone_name):
-    """Parent an object to a specific bone using the operator
-    so Blender computes the correct inverse matrix automatically."""
-    bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True)
-    armature.select_set(True)
-    bpy.context.view_layer.objects.active = armature
-    armature.data.bones.active = armature.data.bones[bone_name]
-    bpy.ops.object.parent_set(type='BONE')
+    """Parent an object to a specific bone, keeping its world transform.
+    The inverse is the bone's rest matrix at its tail — the same one
+    parent_set(type='BONE') computes — so no operator or selection needed."""
+    bone = armature.data.bones[bone_name]
+    obj.parent = armature
+    obj.parent_type = 'BONE'
+    obj.parent_bone = bone_name
+    obj.matrix_parent_inverse = (armature.matrix_world @ bone.matrix_local @
+                                 Matrix.Translation((0, bone.length, 0))).inverted()
 
 
 # ──────────────────────────────────────────────
@@ -229,8 +309,6 @@ def build_body_parts():
                           (0.08, 0.04, 0.28), MAT_LEATHER,
                           rotation=(0, 0, math.radians(20))))
     bevel_object(parts[-1], 0.01)
-    for p in parts:
-        apply_modifiers(p)
     groups["Spine"] = join_objects(parts, "Grp_Spine")
 
     # ── HEAD (wide skull + heavy brow + small eyes + big jaw + tusks + ears) ──
@@ -270,15 +348,13 @@ def build_body_parts():
     parts.append(add_wedge("EarR", ( 0.26, 0, z(0.74)),
                            (0.08, 0.14, 0.16), MAT_SKIN_DK,
                            rotation=(0, 0, math.radians(30))))
-    for p in parts:
-        apply_modifiers(p)
     groups["Head"] = join_objects(parts, "Grp_Head")
 
     # ── LEFT UPPER ARM — thick ──
     p = add_cube("ArmLUpper", (-0.34, 0, z(0.50)),
                  (0.18, 0.18, 0.24), MAT_SKIN)
-    bevel_object(p, 0.03); apply_modifiers(p)
-    groups["L_UpperArm"] = p
+    bevel_object(p, 0.03)
+    groups["L_UpperArm"] = join_objects([p], "ArmLUpper")
 
     # ── LEFT FOREARM + HAND (fist) + WRISTGUARD ──
     parts = []
@@ -292,15 +368,13 @@ def build_body_parts():
     parts.append(add_cube("WristL", (-0.36, -0.04, z(0.26)),
                           (0.19, 0.19, 0.06), MAT_STONE))
     bevel_object(parts[-1], 0.01)
-    for p in parts:
-        apply_modifiers(p)
     groups["L_ForeArm"] = join_objects(parts, "Grp_L_ForeArm")
 
     # ── RIGHT UPPER ARM — thick ──
     p = add_cube("ArmRUpper", (0.34, 0, z(0.50)),
                  (0.18, 0.18, 0.24), MAT_SKIN)
-    bevel_object(p, 0.03); apply_modifiers(p)
-    groups["R_UpperArm"] = p
+    bevel_object(p, 0.03)
+    groups["R_UpperArm"] = join_objects([p], "ArmRUpper")
 
     # ── RIGHT FOREARM + HAND + WRISTGUARD + STONE MAUL ──
     parts = []
@@ -329,15 +403,13 @@ def build_body_parts():
                           (0.15, 0.02, 0.13), MAT_METAL))
     parts.append(add_cube("MaulBand2", (0.36, -0.49, z(0.20)),
                           (0.15, 0.02, 0.13), MAT_METAL))
-    for p in parts:
-        apply_modifiers(p)
     groups["R_ForeArm"] = join_objects(parts, "Grp_R_ForeArm")
 
     # ── LEFT UPPER LEG — thick ──
     p = add_cube("LegLUpper", (-0.15, 0, z(0.12)),
                  (0.18, 0.20, 0.22), MAT_SKIN)
-    bevel_object(p, 0.03); apply_modifiers(p)
-    groups["L_UpperLeg"] = p
+    bevel_object(p, 0.03)
+    groups["L_UpperLeg"] = join_objects([p], "LegLUpper")
 
     # ── LEFT LOWER LEG + FOOT ──
     parts = []
@@ -347,15 +419,13 @@ def build_body_parts():
     parts.append(add_cube("FootL", (-0.15, -0.06, z(-0.08)),
                           (0.16, 0.22, 0.08), MAT_LEATHER))
     bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
     groups["L_LowerLeg"] = join_objects(parts, "Grp_L_LowerLeg")
 
     # ── RIGHT UPPER LEG — thick ──
     p = add_cube("LegRUpper", (0.15, 0, z(0.12)),
                  (0.18, 0.20, 0.22), MAT_SKIN)
-    bevel_object(p, 0.03); apply_modifiers(p)
-    groups["R_UpperLeg"] = p
+    bevel_object(p, 0.03)
+    groups["R_UpperLeg"] = join_objects([p], "LegRUpper")
 
     # ── RIGHT LOWER LEG + FOOT ──
     parts = []
@@ -365,10 +435,17 @@ def build_body_parts():
     parts.append(add_cube("FootR", (0.15, -0.06, z(-0.08)),
                           (0.16, 0.22, 0.08), MAT_LEATHER))
     bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
     groups["R_LowerLeg"] = join_objects(parts, "Grp_R_LowerLeg")
 
+    # Hand the finished groups to the scene in one go and drop the staging
+    # collection
+    for obj in groups.values():
+        bpy.context.collection.objects.link(obj)
+    bpy.data.collections.remove(_build_collection())
+    # The part meshes were only ever read by join_objects
+    bpy.data.batch_remove(ids=list(_MESH_CACHE.values()))
+    _MESH_CACHE.clear()
+
     return groups
 
 
@@ -441,228 +518,193 @@ def rig_model(arm_obj, groups):
 #  Animations
 # ──────────────────────────────────────────────
 
-def set_bone_rot(pose_bone, x_deg, y_deg, z_deg):
-    """Set rotation in Euler degrees."""
-    pose_bone.rotation_mode = 'XYZ'
-    pose_bone.rotation_euler = (
-        math.radians(x_deg),
-        math.radians(y_deg),
-        math.radians(z_deg)
-    )
-
-
-def set_bone_loc(pose_bone, x, y, z_val):
-    """Set bone location offset."""
-    pose_bone.location = (x, y, z_val)
-
-
-def key_all_bones(arm_obj, frame):
-    """Insert keyframes for rotation & location on all pose bones."""
-    for pb in arm_obj.pose.bones:
-        pb.keyframe_insert(data_path="rotation_euler", frame=frame)
-        pb.keyframe_insert(data_path="location", frame=frame)
-
-
-def reset_pose(arm_obj):
-    """Reset all pose bones to rest."""
-    for pb in arm_obj.pose.bones:
-        pb.rotation_mode = 'XYZ'
-        pb.rotation_euler = (0, 0, 0)
-        pb.location = (0, 0, 0)
-
-
-def create_walk_cycle(arm_obj):
-    """Create a looping walk cycle — 24 frames at 24fps = 1 second.
-    Based on BasicOrc walk but with reduced swing for heavier gait."""
-    action = bpy.data.actions.new("Walk")
-    arm_obj.animation_data_create()
-    arm_obj.animation_data.action = action
-
-    pb = arm_obj.pose.bones
-    swing = 30   # leg swing angle (same as BasicOrc)
-    arm_sw = 20  # arm counter-swing (same as BasicOrc)
-    bob = 0.02   # slight up/down on root
-
-    # Frame 1: neutral (start of loop)
-    reset_pose(arm_obj)
-    key_all_bones(arm_obj, 1)
-
-    # Frame 7: left leg forward, right leg back
-    reset_pose(arm_obj)
-    set_bone_rot(pb["L_UpperLeg"],  swing, 0, 0)
-    set_bone_rot(pb["L_LowerLeg"], -swing*0.3, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"], -swing, 0, 0)
-    set_bone_rot(pb["R_LowerLeg"],  0, 0, 0)
-    set_bone_rot(pb["R_UpperArm"],  arm_sw, 0, 0)
-    set_bone_rot(pb["R_ForeArm"],  -arm_sw*0.4, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -arm_sw, 0, 0)
-    set_bone_rot(pb["L_ForeArm"],   0, 0, 0)
-    set_bone_loc(pb["Root"], 0, 0, bob)
-    set_bone_rot(pb["Spine"], 0, 0, 3)  # slight torso twist
-    key_all_bones(arm_obj, 7)
-
-    # Frame 13: neutral (mid loop)
-    reset_pose(arm_obj)
-    key_all_bones(arm_obj, 13)
-
-    # Frame 19: right leg forward, left leg back (mirror of frame 7)
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_UpperLeg"],  swing, 0, 0)
-    set_bone_rot(pb["R_LowerLeg"], -swing*0.3, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"], -swing, 0, 0)
-    set_bone_rot(pb["L_LowerLeg"],  0, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],  arm_sw, 0, 0)
-    set_bone_rot(pb["L_ForeArm"],  -arm_sw*0.4, 0, 0)
-    set_bone_rot(pb["R_UpperArm"], -arm_sw, 0, 0)
-    set_bone_rot(pb["R_ForeArm"],   0, 0, 0)
-    set_bone_loc(pb["Root"], 0, 0, bob)
-    set_bone_rot(pb["Spine"], 0, 0, -3)
-    key_all_bones(arm_obj, 19)
-
-    # Frame 25: same as frame 1 for seamless loop
-    reset_pose(arm_obj)
-    key_all_bones(arm_obj, 25)
-
-    # Make all F-curves linear for snappy movement
-    for fc in action.fcurves:
-        for kp in fc.keyframe_points:
-            kp.interpolation = 'LINEAR'
-
-    action.use_fake_user = True
-    print("  Walk cycle created (frames 1-25, loop)")
-    return action
-
-
-def create_attack_anim(arm_obj):
-    """Overhead club smash — based on BasicOrc attack pattern.
-    Club arm raises beside head, then slams down. 20 frames."""
-    action = bpy.data.actions.new("Attack")
-    arm_obj.animation_data.action = action
-
-    pb = arm_obj.pose.bones
-
+def bake_poses(bone_names, poses):
+    """Turn (frame, {bone: rotation degrees}, {bone: location}) rows into
+    frames plus a (frames, bones, 6) table for write_fcurves.  Bones a row
+    doesn't mention stay at rest, with no pose reset between keys."""
+    bone_index = {name: i for i, name in enumerate(bone_names)}
+    frames = np.array([frame for frame, _rots, _locs in poses], dtype=np.float32)
+    values = np.zeros((len(poses), len(bone_names), 6), dtype=np.float32)
+    for row, (_frame, rots, locs) in enumerate(poses):
+        for bone, rot in rots.items():
+            values[row, bone_index[bone], :3] = rot
+        for bone, loc in locs.items():
+            values[row, bone_index[bone], 3:] = loc
+    # Every rotation to radians in one vectorized call
+    values[:, :, :3] = np.radians(values[:, :, :3])
+    return frames, values
+
+
+# Keyframe interpolation enum items, for writing interpolation as ints
+_INTERPOLATION = bpy.types.Keyframe.bl_rna.properties["interpolation"].enum_items
+
+
+def write_fcurves(action, bone_names, frames, values, interpolation, channels=None):
+    """Write a baked pose table into action in one pass.  values is
+    (n_frames, n_bones, 6) — rotation XYZ (radians) then location XYZ per
+    bone; each bone channel gets one fcurve filled with a single
+    foreach_set instead of a keyframe_insert per bone per frame.
+    channels is an optional (n_bones, 6) bool mask of the channels to
+    write; None writes them all."""
+    interp = [_INTERPOLATION[interpolation].value] * len(frames)
+    co = np.empty(len(frames) * 2, dtype=np.float32)
+    co[0::2] = frames
+    for b, name in enumerate(bone_names):
+        for c, prop in enumerate(("rotation_euler", "location")):
+            data_path = f'pose.bones["{name}"].{prop}'
+            for axis in range(3):
+                if channels is not None and not channels[b, c * 3 + axis]:
+                    continue
+                fc = action.fcurves.new(data_path, index=axis, action_group=name)
+                fc.keyframe_points.add(len(frames))
+                co[1::2] = values[:, b, c * 3 + axis]
+                fc.keyframe_points.foreach_set("co", co)
+                fc.keyframe_points.foreach_set("interpolation", interp)
+                fc.update()
+
+
+def _walk_poses(swing=30, arm_sw=20, bob=0.02):
+    """Looping walk cycle — 24 frames at 24fps = 1 second.  Based on
+    BasicOrc walk but with reduced swing for heavier gait (same 30° leg /
+    20° arm swing, 2 cm bob).  Frame 7 is the left-foot-forward stride;
+    frame 19 is the same stride mirrored left/right with the torso twist
+    flipped, and frames 1/13/25 are rest, so the loop closes seamlessly."""
+    stride = {"L_UpperLeg": ( swing,        0, 0),
+              "L_LowerLeg": (-swing * 0.3,  0, 0),
+              "R_UpperLeg": (-swing,        0, 0),
+              "R_UpperArm": ( arm_sw,       0, 0),
+              "R_ForeArm":  (-arm_sw * 0.4, 0, 0),
+              "L_UpperArm": (-arm_sw,       0, 0),
+              "Spine":      (0, 0, 3)}               # slight torso twist
+    swap = {"L_": "R_", "R_": "L_"}
+    mirrored = {swap.get(bone[:2], bone[:2]) + bone[2:]: rot
+                for bone, rot in stride.items()}
+    mirrored["Spine"] = (0, 0, -3)
+    bob_loc = {"Root": (0, 0, bob)}                  # slight up/down
+    return [(1, {}, {}), (7, stride, bob_loc), (13, {}, {}),
+            (19, mirrored, bob_loc), (25, {}, {})]
+
+
+# Each clip is (frame, {bone: rotation degrees}, {bone: location}) rows for
+# bake_poses; bones a row leaves out are at rest.  Linear keys for the
+# walk's snappy movement.
+WALK_POSES = _walk_poses()
+
+# Overhead club smash — based on BasicOrc attack pattern.  Club arm raises
+# beside head, then slams down.  20 frames.
+ATTACK_POSES = [
     # Frame 1: rest
-    reset_pose(arm_obj)
-    key_all_bones(arm_obj, 1)
-
+    (1, {}, {}),
     # Frame 5: wind up — raise club arm up beside head
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_UpperArm"],  0, 0, -70)   # raise arm up beside head
-    set_bone_rot(pb["R_ForeArm"],  -30, 0, 0)    # bend forearm back behind head
-    set_bone_rot(pb["Spine"],        0, 0, -5)    # slight lean back
-    set_bone_rot(pb["Head"],         0, 0, 0)
-    key_all_bones(arm_obj, 5)
-
+    (5, {"R_UpperArm": (0, 0, -70),    # raise arm up beside head
+         "R_ForeArm":  (-30, 0, 0),    # bend forearm back behind head
+         "Spine":      (0, 0, -5),     # slight lean back
+         "Head":       (0, 0, 0)}, {}),
     # Frame 8: peak of wind-up
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_UpperArm"],  0, 0, -85)   # arm fully raised
-    set_bone_rot(pb["R_ForeArm"],  -40, 0, 0)    # forearm bent back
-    set_bone_rot(pb["Spine"],       -5, 0, -8)    # lean back into swing
-    set_bone_rot(pb["Head"],         5, 0, 0)
-    key_all_bones(arm_obj, 8)
-
+    (8, {"R_UpperArm": (0, 0, -85),    # arm fully raised
+         "R_ForeArm":  (-40, 0, 0),    # forearm bent back
+         "Spine":      (-5, 0, -8),    # lean back into swing
+         "Head":       (5, 0, 0)}, {}),
     # Frame 11: slam down — arm comes down past horizontal
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_UpperArm"],  15, 0, 30)   # arm swung down and forward
-    set_bone_rot(pb["R_ForeArm"],   20, 0, 0)    # forearm extends
-    set_bone_rot(pb["Spine"],        8, 0, 5)     # lunge forward
-    set_bone_rot(pb["Head"],        -5, 0, 0)
-    set_bone_loc(pb["Root"], 0, -0.02, -0.03)    # crouch into swing
-    key_all_bones(arm_obj, 11)
-
+    (11, {"R_UpperArm": (15, 0, 30),   # arm swung down and forward
+          "R_ForeArm":  (20, 0, 0),    # forearm extends
+          "Spine":      (8, 0, 5),     # lunge forward
+          "Head":       (-5, 0, 0)},
+         {"Root": (0, -0.02, -0.03)}),  # crouch into swing
     # Frame 14: impact hold
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_UpperArm"],  10, 0, 25)   # arm low, impact position
-    set_bone_rot(pb["R_ForeArm"],   15, 0, 0)
-    set_bone_rot(pb["Spine"],        5, 0, 3)
-    set_bone_loc(pb["Root"], 0, -0.02, -0.02)
-    key_all_bones(arm_obj, 14)
-
+    (14, {"R_UpperArm": (10, 0, 25),   # arm low, impact position
+          "R_ForeArm":  (15, 0, 0),
+          "Spine":      (5, 0, 3)},
+         {"Root": (0, -0.02, -0.02)}),
     # Frame 20: recover to rest
-    reset_pose(arm_obj)
-    key_all_bones(arm_obj, 20)
-
-    for fc in action.fcurves:
-        for kp in fc.keyframe_points:
-            kp.interpolation = 'BEZIER'
-
-    action.use_fake_user = True
-    print("  Attack animation created (frames 1-20)")
-    return action
-
-
-def create_die_anim(arm_obj):
-    """Stagger and topple backward — 30 frames.
-    Based on BasicOrc die but with arms ending in X/Y ground plane:
-    R arm toward -X/+Y, L arm toward +X/-Y."""
-    action = bpy.data.actions.new("Die")
-    arm_obj.animation_data.action = action
+    (20, {}, {}),
+]
 
-    pb = arm_obj.pose.bones
-
-    # Frame 1: alive
-    reset_pose(arm_obj)
-    key_all_bones(arm_obj, 1)
 
+# Stagger and topple backward — 30 frames.  Based on BasicOrc die but
+# with arms ending in X/Y ground plane: R arm toward -X/+Y, L arm toward +X/-Y.
+DIE_POSES = [
     # Root bone points up (+Z world), so bone local Y = world Z.
     # To move DOWN: negative Y.  To move BACKWARD: positive Z.
-
+    # Frame 1: alive
+    (1, {}, {}),
     # Frame 6: hit stagger — lurch forward
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],    15, 0, 0)
-    set_bone_rot(pb["Head"],     10, 0, 5)
-    set_bone_rot(pb["R_UpperArm"], 10, 0, 20)
-    set_bone_rot(pb["L_UpperArm"], 10, 0, -20)
-    set_bone_loc(pb["Root"], 0, -0.02, 0)
-    key_all_bones(arm_obj, 6)
-
+    (6, {"Spine":      (15, 0, 0),
+         "Head":       (10, 0, 5),
+         "R_UpperArm": (10, 0, 20),
+         "L_UpperArm": (10, 0, -20)},
+        {"Root": (0, -0.02, 0)}),
     # Frame 12: recoil backward — legs match spine tilt
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],    -20, 0, 3)
-    set_bone_rot(pb["Head"],     -15, 0, -5)
-    set_bone_rot(pb["R_UpperArm"], -20, 0, 30)
-    set_bone_rot(pb["R_ForeArm"],  -20, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -20, 0, -30)
-    set_bone_rot(pb["L_ForeArm"],  -20, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"], -20, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"], -20, 0, 0)
-    set_bone_loc(pb["Root"], 0, -0.05, 0.05)
-    key_all_bones(arm_obj, 12)
-
+    (12, {"Spine":      (-20, 0, 3),
+          "Head":       (-15, 0, -5),
+          "R_UpperArm": (-20, 0, 30),
+          "R_ForeArm":  (-20, 0, 0),
+          "L_UpperArm": (-20, 0, -30),
+          "L_ForeArm":  (-20, 0, 0),
+          "L_UpperLeg": (-20, 0, 0),
+          "R_UpperLeg": (-20, 0, 0)},
+         {"Root": (0, -0.05, 0.05)}),
     # Frame 20: falling — whole body rigid, legs follow spine
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],    -50, 0, 5)
-    set_bone_rot(pb["Head"],     -30, 0, -10)
-    set_bone_rot(pb["R_UpperArm"], -40, 0, 45)
-    set_bone_rot(pb["R_ForeArm"],  -30, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -40, 0, -45)
-    set_bone_rot(pb["L_ForeArm"],  -30, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"], -50, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"], -50, 0, 0)
-    set_bone_loc(pb["Root"], 0, -0.20, 0.15)
-    key_all_bones(arm_obj, 20)
-
+    (20, {"Spine":      (-50, 0, 5),
+          "Head":       (-30, 0, -10),
+          "R_UpperArm": (-40, 0, 45),
+          "R_ForeArm":  (-30, 0, 0),
+          "L_UpperArm": (-40, 0, -45),
+          "L_ForeArm":  (-30, 0, 0),
+          "L_UpperLeg": (-50, 0, 0),
+          "R_UpperLeg": (-50, 0, 0)},
+         {"Root": (0, -0.20, 0.15)}),
     # Frame 30: on the ground — arms splayed in ground plane
     # Values captured from manual pose in Blender
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],      -80.0,   0.0,    5.0)
-    set_bone_rot(pb["Head"],        -1.6,   8.7,  -21.9)
-    set_bone_rot(pb["R_UpperArm"], -30.0,   0.0,   60.0)
-    set_bone_rot(pb["R_ForeArm"],  -55.4, -43.6,  -33.8)
-    set_bone_rot(pb["L_UpperArm"],  98.2,  57.5,   43.9)
-    set_bone_rot(pb["L_ForeArm"],  -57.1,  -0.2,   25.2)
-    set_bone_rot(pb["L_UpperLeg"], -80.0,   0.0,    0.0)
-    set_bone_rot(pb["R_UpperLeg"], -80.0,   0.0,    0.0)
-    set_bone_loc(pb["Root"], 0, -0.35, 0.30)
-    key_all_bones(arm_obj, 30)
-
-    for fc in action.fcurves:
-        for kp in fc.keyframe_points:
-            kp.interpolation = 'BEZIER'
-
-    action.use_fake_user = True
-    print("  Die animation created (frames 1-30)")
-    return action
+    (30, {"Spine":      (-80.0, 0.0, 5.0),
+          "Head":       (-1.6, 8.7, -21.9),
+          "R_UpperArm": (-30.0, 0.0, 60.0),
+          "R_ForeArm":  (-55.4, -43.6, -33.8),
+          "L_UpperArm": (98.2, 57.5, 43.9),
+          "L_ForeArm":  (-57.1, -0.2, 25.2),
+          "L_UpperLeg": (-80.0, 0.0, 0.0),
+          "R_UpperLeg": (-80.0, 0.0, 0.0)},
+         {"Root": (0, -0.35, 0.30)}),
+]
+
+
+# (action name, poses, interpolation, log line)
+ANIMATIONS = [
+    ("Walk",   WALK_POSES,   'LINEAR', "Walk cycle created (frames 1-25, loop)"),
+    ("Attack", ATTACK_POSES, 'BEZIER', "Attack animation created (frames 1-20)"),
+    ("Die",    DIE_POSES,    'BEZIER', "Die animation created (frames 1-30)"),
+]
+
+
+def build_all_animations(arm_obj):
+    """Write every clip in ANIMATIONS in one pass.  All tables are baked
+    first so the channel mask is known up front: a channel no clip moves
+    stays at rest whichever clip plays and gets no fcurve, while one that
+    only some clips move is keyed (at rest) in the others too, or the
+    exporter would carry the last clip's pose into them.  Returns the
+    actions in ANIMATIONS order."""
+    arm_obj.animation_data_create()
+    # Pose bones are fetched once; everything after this works on names
+    # and baked arrays, never indexing the collection again
+    pose_bones = list(arm_obj.pose.bones)
+    bone_names = [pb.name for pb in pose_bones]
+    for pb in pose_bones:
+        pb.rotation_mode = 'XYZ'
+
+    baked = [bake_poses(bone_names, poses) for _name, poses, _i, _l in ANIMATIONS]
+    channels = np.zeros((len(bone_names), 6), dtype=bool)
+    for _frames, values in baked:
+        channels |= (values != 0).any(axis=0)
+
+    actions = []
+    for (action_name, _poses, interpolation, _log), (frames, values) in zip(ANIMATIONS, baked):
+        action = bpy.data.actions.new(action_name)
+        arm_obj.animation_data.action = action
+        write_fcurves(action, bone_names, frames, values, interpolation,
+                      channels=channels)
+        action.use_fake_user = True
+        actions.append(action)
+    return actions
 
 
 # ──────────────────────────────────────────────
@@ -682,32 +724,31 @@ def main():
     # Rig: parent each mesh to its bone
     rig_model(arm_obj, groups)
 
-    # Switch to pose mode for animation
-    bpy.context.view_layer.objects.active = arm_obj
-    bpy.ops.object.mode_set(mode='POSE')
+    # Create animation clips — keys go straight into fcurves, so no
+    # Pose Mode is needed for this
+    walk_action, attack_action, die_action = build_all_animations(arm_obj)
 
-    # Create animation clips
-    walk_action   = create_walk_cycle(arm_obj)
-    attack_action = create_attack_anim(arm_obj)
-    die_action    = create_die_anim(arm_obj)
-
-    # Push each action onto its own NLA track so all export correctly
+    # Push each action onto its own NLA track so all export correctly.
+    # Start frames are read up front so the loop only creates tracks and
+    # strips (strips.new already names the strip after the action); the
+    # tracks are muted afterwards so they don't blend together.
     anim_data = arm_obj.animation_data
+    pushes = [(a, int(a.frame_range[0]))
+              for a in (walk_action, attack_action, die_action)]
 
-    for action in [walk_action, attack_action, die_action]:
+    tracks = []
+    for action, start in pushes:
         track = anim_data.nla_tracks.new()
         track.name = action.name
-        strip = track.strips.new(action.name, int(action.frame_range[0]), action)
-        strip.name = action.name
-        track.mute = True  # muted so NLA tracks don't blend together
+        track.strips.new(action.name, start, action)
+        tracks.append(track)
+    for track in tracks:
+        track.mute = True
 
     # Leave Die action active so user can preview/tweak the death end pose
     anim_data.action = die_action
     bpy.context.scene.frame_set(30)
 
-    # Temporarily exit Pose Mode to add lights/camera
-    bpy.ops.object.mode_set(mode='OBJECT')
-
     # Lighting for preview
     bpy.ops.object.light_add(type='SUN', location=(3, -3, 5))
     bpy.context.active_object.name = "KeyLight"
@@ -729,25 +770,30 @@ def main():
     bpy.context.scene.frame_end = 30
     bpy.context.scene.render.fps = 24
 
-    # Re-select armature and enter Pose Mode at frame 30 (Die end pose)
-    # so user can preview and manually adjust the death animation
+    # Re-select armature at frame 30 (Die end pose); in the UI also enter
+    # Pose Mode so user can preview and manually adjust the death animation.
+    # Background (CLI) runs have no screen and skip the mode switch.
     bpy.ops.object.select_all(action='DESELECT')
     arm_obj.select_set(True)
     bpy.context.view_layer.objects.active = arm_obj
-    bpy.ops.object.mode_set(mode='POSE')
+    if bpy.context.screen:
+        bpy.ops.object.mode_set(mode='POSE')
     bpy.context.scene.frame_set(30)
 
-    print("=" * 50)
-    print("  Troll — rigged & animated!")
-    print("  Actions: Walk (1-25 loop), Attack (1-20 smash), Die (1-30)")
-    print("")
-    print("  Die action is ACTIVE at frame 30 — you can adjust the death pose.")
-    print("  Scrub the timeline to preview animations.")
-    print("  To switch actions: select the armature, go to Action Editor,")
-    print("  and pick Walk/Attack/Die from the dropdown.")
-    print("")
-    print("  To export for Unity, run export_troll.py")
-    print("=" * 50)
+    # Clip log lines and the summary go out as one write
+    print("\n".join([f"  {log_line}" for *_, log_line in ANIMATIONS] + [
+        "=" * 50,
+        "  Troll — rigged & animated!",
+        "  Actions: Walk (1-25 loop), Attack (1-20 smash), Die (1-30)",
+        "",
+        "  Die action is ACTIVE at frame 30 — you can adjust the death pose.",
+        "  Scrub the timeline to preview animations.",
+        "  To switch actions: select the armature, go to Action Editor,",
+        "  and pick Walk/Attack/Die from the dropdown.",
+        "",
+        "  To export for Unity, run export_troll.py",
+        "=" * 50,
+    ]))
 
 
 if __name__ == "__main__":
@@ -14,126 +14,290 @@ Single armature with R_Hand/L_Hand bones. Rigid-body bone parenting.
 """
 
 import bpy
+import bmesh
 import math
-from mathutils import Vector, Euler
+import numpy as np
+from mathutils import Vector, Euler, Matrix
 
 # ──────────────────────────────────────────────
 #  Utility helpers
 # ──────────────────────────────────────────────
 
 def clear_scene():
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for block in bpy.data.meshes:
-        if block.users == 0:
-            bpy.data.meshes.remove(block)
-    for block in bpy.data.armatures:
-        if block.users == 0:
-            bpy.data.armatures.remove(block)
-    for block in list(bpy.data.actions):
-        block.use_fake_user = False
-        bpy.data.actions.remove(block)
-    for block in bpy.data.materials:
-        if block.users == 0:
-            bpy.data.materials.remove(block)
+    """Remove everything, including fake-user actions from prior runs."""
+    # One C-level batch_remove instead of a remove() per datablock.  With
+    # the objects going too nothing else references the meshes, armatures,
+    # materials, lights and cameras, so they go wholesale rather than by
+    # users == 0.
+    bpy.data.batch_remove(ids=[*bpy.data.objects, *bpy.data.meshes,
+                               *bpy.data.armatures, *bpy.data.actions,
+                               *bpy.data.materials, *bpy.data.lights,
+                               *bpy.data.cameras])
+    # The shared part meshes were removed above
+    _MESH_CACHE.clear()
+    _BEVEL_CACHE.clear()
+
+
+# Socket name -> index on the Principled BSDF, filled by the first material
+_SOCKETS = {}
 
 
 def make_material(name, color, emission=0.0, roughness=0.9):
-    mat = bpy.data.materials.new(name)
-    mat.use_nodes = True
-    bsdf = mat.node_tree.nodes.get("Principled BSDF")
-    bsdf.inputs["Base Color"].default_value = color
-    bsdf.inputs["Roughness"].default_value = roughness
+    # All of the wizard's materials are copies of one bare node tree that
+    # differ only in the inputs below; clear_scene frees that base, so it
+    # is rebuilt on the first call of each run
+    base = bpy.data.materials.get("_MaterialTemplate")
+    if base is None:
+        base = bpy.data.materials.new("_MaterialTemplate")
+        base.use_nodes = True
+    mat = base.copy()
+    mat.name = name
+    inputs = mat.node_tree.nodes.get("Principled BSDF").inputs
+    values = {"Base Color": color, "Roughness": roughness}
     if emission > 0:
-        bsdf.inputs["Emission Color"].default_value = color
-        bsdf.inputs["Emission Strength"].default_value = emission
+        values["Emission Color"] = color
+        values["Emission Strength"] = emission
+    for socket, value in values.items():
+        if socket not in _SOCKETS:
+            idx = inputs.find(socket)
+            if idx < 0:
+                raise KeyError(f"Principled BSDF has no input {socket!r}")
+            _SOCKETS[socket] = idx
+        inputs[_SOCKETS[socket]].default_value = value
     return mat
 
 
-def add_cube(name, location, scale, material, rotation=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cube_add(size=1, location=location)
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
+# Unit primitives with the same vertex layout and face winding as
+# bpy.ops.mesh.primitive_*_add (size 1 / radius 0.5, depth 1), so parts
+# can be built straight from vertex data instead of through operators.
+_CUBE_VERTS = np.array([( 1,  1,  1), ( 1,  1, -1), ( 1, -1,  1), ( 1, -1, -1),
+                        (-1,  1,  1), (-1,  1, -1), (-1, -1,  1), (-1, -1, -1)],
+                       dtype=np.float32) * 0.5
+_CUBE_FACES = [(0, 4, 6, 2), (3, 2, 6, 7), (7, 6, 4, 5),
+               (5, 1, 3, 7), (1, 0, 2, 3), (5, 4, 0, 1)]
+
+
+def _flatten(faces):
+    """Face tuples as (loop vertex indices, loop totals) int32 arrays, the
+    layout mesh.loops/polygons.foreach_set take."""
+    vidx = np.array([i for f in faces for i in f], dtype=np.int32)
+    totals = np.array([len(f) for f in faces], dtype=np.int32)
+    return vidx, totals
+
+
+_CUBE_TOPOLOGY = _flatten(_CUBE_FACES)
+
+
+def _ring(n, z):
+    """n vertices on a radius-0.5 circle, first on +Y, CCW seen from +Z."""
+    theta = 2.0 * np.pi * np.arange(n) / n
+    return np.stack([-0.5 * np.sin(theta), 0.5 * np.cos(theta),
+                     np.full(n, z)], axis=1)
+
+
+# Unit cone/cylinder geometry by (kind, ring size), built once per session
+_GEOMETRY_CACHE = {}
+
+
+def _cone_geometry(n):
+    geo = _GEOMETRY_CACHE.get(("Cone", n))
+    if geo is None:
+        verts = np.concatenate([_ring(n, -0.5), [(0.0, 0.0, 0.5)]]).astype(np.float32)
+        faces = [(i, (i + 1) % n, n) for i in range(n)]
+        faces.append(tuple(reversed(range(n))))     # base cap
+        geo = _GEOMETRY_CACHE[("Cone", n)] = (verts, _flatten(faces))
+    return geo
+
+
+def _cylinder_geometry(n):
+    geo = _GEOMETRY_CACHE.get(("Cylinder", n))
+    if geo is None:
+        verts = np.concatenate([_ring(n, -0.5), _ring(n, 0.5)]).astype(np.float32)
+        faces = [(i, (i + 1) % n, n + (i + 1) % n, n + i) for i in range(n)]
+        faces.append(tuple(range(n, 2 * n)))        # top cap
+        faces.append(tuple(reversed(range(n))))     # bottom cap
+        geo = _GEOMETRY_CACHE[("Cylinder", n)] = (verts, _flatten(faces))
+    return geo
+
+
+_WEDGE_VERTS, _WEDGE_TOPOLOGY = _cone_geometry(4)
+
+
+def _rot_scale(scale, rotation):
+    """Rotation (XYZ Euler) · scale as a 3x3 numpy matrix — what
+    transform_apply(rotation=True, scale=True) bakes into the vertices."""
+    cx, cy, cz = np.cos(rotation)
+    sx, sy, sz = np.sin(rotation)
+    rx = np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]])
+    ry = np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]])
+    rz = np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]])
+    return (rz @ ry @ rx) * np.asarray(scale, dtype=np.float64)
+
+
+def _build_mesh_fast(name, verts, topology):
+    """New mesh from (N, 3) verts and flattened faces, sized up front and
+    filled with foreach_set from float32/int32 buffers instead of
+    from_pydata's per-vertex Python conversion."""
+    vidx, totals = topology
+    me = bpy.data.meshes.new(name)
+    me.vertices.add(len(verts))
+    me.vertices.foreach_set("co", np.ascontiguousarray(verts, dtype=np.float32).ravel())
+    me.loops.add(len(vidx))
+    me.loops.foreach_set("vertex_index", vidx)
+    me.polygons.add(len(totals))
+    me.polygons.foreach_set("loop_start", np.cumsum(totals, dtype=np.int32) - totals)
+    me.update(calc_edges=True)
+    return me
+
+
+# Part meshes with rotation/scale already baked in, by (primitive,
+# material, scale, rotation); mirrored and repeated parts (brows, eyes,
+# ears, sleeves, hands, legs, prongs) share one
+_MESH_CACHE = {}
+
+
+def _shared_mesh(key, verts, topology, material, scale, rotation):
+    cache_key = (key, material, tuple(scale), tuple(rotation))
+    me = _MESH_CACHE.get(cache_key)
+    if me is None:
+        me = _build_mesh_fast(f"{key}_{material.name}",
+                              verts @ _rot_scale(scale, rotation).T, topology)
+        me.materials.append(material)
+        _MESH_CACHE[cache_key] = me
+    return me
+
+
+def _add_mesh_fast(name, key, verts, topology, location, scale, rotation, material):
+    """Create a part object directly through bpy.data as a linked duplicate
+    of its shared mesh.  Rotation and scale are baked into that mesh in
+    numpy, as transform_apply did, so the object only carries its
+    location.  It isn't linked to the scene; build_body_parts links the
+    finished groups."""
+    me = _shared_mesh(key, verts, topology, material, scale, rotation)
+    obj = bpy.data.objects.new(name, me)
+    obj.location = location
     return obj
 
 
+def add_cube(name, location, scale, material, rotation=(0, 0, 0)):
+    return _add_mesh_fast(name, "Cube", _CUBE_VERTS, _CUBE_TOPOLOGY,
+                          location, scale, rotation, material)
+
+
 def add_wedge(name, location, scale, material, rotation=(0, 0, 0)):
-    bpy.ops.mesh.primitive_cone_add(
-        vertices=4, radius1=0.5, radius2=0.0, depth=1.0,
-        location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
+    return _add_mesh_fast(name, "Wedge", _WEDGE_VERTS, _WEDGE_TOPOLOGY,
+                          location, scale, rotation, material)
 
 
 def add_cylinder(name, location, scale, material, rotation=(0, 0, 0), vertices=8):
-    bpy.ops.mesh.primitive_cylinder_add(
-        vertices=vertices, radius=0.5, depth=1.0,
-        location=location
-    )
-    obj = bpy.context.active_object
-    obj.name = name
-    obj.scale = scale
-    obj.rotation_euler = rotation
-    bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
-    if obj.data.materials:
-        obj.data.materials[0] = material
-    else:
-        obj.data.materials.append(material)
-    return obj
+    verts, topology = _cylinder_geometry(vertices)
+    return _add_mesh_fast(name, f"Cylinder{vertices}", verts, topology,
+                          location, scale, rotation, material)
 
 
-def bevel_object(obj, width=0.02, segments=1):
-    mod = obj.modifiers.new("Bevel", 'BEVEL')
-    mod.width = width
-    mod.segments = segments
-    mod.limit_method = 'ANGLE'
-    mod.angle_limit = math.radians(60)
+BEVEL_ANGLE = math.radians(60)
+
 
+# Bevelled copies of the shared part meshes, by (mesh, width, segments),
+# so mirrored and repeated parts run the bevel once between them
+_BEVEL_CACHE = {}
 
-def apply_modifiers(obj):
-    bpy.context.view_layer.objects.active = obj
-    for mod in obj.modifiers[:]:
-        try:
-            bpy.ops.object.modifier_apply(modifier=mod.name)
-        except Exception:
-            pass
+
+def bevel_object(obj, width=0.02, segments=1):
+    """Bake the bevel into a copy of the part's mesh with bmesh (ANGLE limit
+    60°, as the Bevel modifier had), so there's no modifier to apply and
+    no depsgraph evaluation per part.  Scale is already in the vertices,
+    so the width is in world units, and the shared unbevelled mesh stays
+    as it is for its other users."""
+    key = (obj.data, width, segments)
+    me = _BEVEL_CACHE.get(key)
+    if me is None:
+        me = obj.data.copy()
+        bm = bmesh.new()
+        bm.from_mesh(me)
+        edges = [e for e in bm.edges
+                 if e.is_manifold and e.calc_face_angle() > BEVEL_ANGLE]
+        bmesh.ops.bevel(bm, geom=edges, offset=width, offset_type='OFFSET',
+                        segments=segments, profile=0.5, affect='EDGES',
+                        clamp_overlap=True, loop_slide=True, material=-1)
+        bm.to_mesh(me)
+        bm.free()
+        _BEVEL_CACHE[key] = me
+    obj.data = me
+
+
+def own_mesh(obj):
+    """Give a part that makes up a group on its own a private copy of its
+    mesh, named after the part.  The cached mesh may also back its mirror
+    (LegLU/LegRU), and the groups are skinned and exported separately."""
+    obj.data = obj.data.copy()
+    obj.data.name = obj.name
+    return obj
 
 
 def join_objects(objects, name):
-    bpy.ops.object.select_all(action='DESELECT')
+    """Merge the parts into one new mesh object with numpy + foreach_set
+    instead of bpy.ops.object.join.  Like join, the result keeps the first
+    part's transform and the parts themselves are removed."""
+    # Parts only carry a location (rotation/scale are baked), so moving
+    # them into the first part's space is a translation
+    origin = np.array(objects[0].location, dtype=np.float32)
+    materials = []
+    cos, vidxs, totals, mat_ids = [], [], [], []
+    v_off = 0
+    for o in objects:
+        me = o.data
+        nv, nl, npoly = len(me.vertices), len(me.loops), len(me.polygons)
+        co = np.empty(nv * 3, dtype=np.float32)
+        me.vertices.foreach_get("co", co)
+        vidx = np.empty(nl, dtype=np.int32)
+        me.loops.foreach_get("vertex_index", vidx)
+        starts = np.empty(npoly, dtype=np.int32)
+        me.polygons.foreach_get("loop_start", starts)
+        sizes = np.empty(npoly, dtype=np.int32)
+        me.polygons.foreach_get("loop_total", sizes)
+        mi = np.empty(npoly, dtype=np.int32)
+        me.polygons.foreach_get("material_index", mi)
+
+        # Loops re-laid out in polygon order, indices past earlier parts
+        cos.append(co.reshape(-1, 3) + (np.array(o.location, dtype=np.float32) - origin))
+        packed = np.cumsum(sizes) - sizes
+        vidxs.append(vidx[np.repeat(starts - packed, sizes) + np.arange(nl)] + v_off)
+        totals.append(sizes)
+        slots = []
+        for mat in me.materials:
+            if mat not in materials:
+                materials.append(mat)
+            slots.append(materials.index(mat))
+        mat_ids.append(np.array(slots, dtype=np.int32)[mi])
+        v_off += nv
+
+    mesh = _build_mesh_fast(name, np.concatenate(cos),
+                            (np.concatenate(vidxs), np.concatenate(totals)))
+    mesh.polygons.foreach_set("material_index", np.concatenate(mat_ids))
+    for mat in materials:
+        mesh.materials.append(mat)
+
+    result = bpy.data.objects.new(name, mesh)
+    result.location = objects[0].location.copy()
+
+    # Part meshes all live in the caches and are reused by later parts,
+    # so only the part objects go
     for o in objects:
-        o.select_set(True)
-    bpy.context.view_layer.objects.active = objects[0]
-    bpy.ops.object.join()
-    result = bpy.context.active_object
-    result.name = name
+        bpy.data.objects.remove(o, do_unlink=True)
     return result
 
 
 def parent_to_bone(obj, armature, bone_name):
-    bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True)
-    armature.select_set(True)
-    bpy.context.view_layer.objects.active = armature
-    armature.data.bones.active = armature.data.bones[bone_name]
-    bpy.ops.object.parent_set(type='BONE')
+    """Parent an object to a specific bone, keeping its world transform.
+    The inverse is the bone's rest matrix at its tail — the same one
+    parent_set(type='BONE') computes — so no operator or selection needed."""
+    bone = armature.data.bones[bone_name]
+    obj.parent = armature
+    obj.parent_type = 'BONE'
+    obj.parent_bone = bone_name
+    obj.matrix_parent_inverse = (armature.matrix_world @ bone.matrix_local @
+                                 Matrix.Translation((0, bone.length, 0))).inverted()
 
 
 # ──────────────────────────────────────────────
@@ -225,8 +389,6 @@ def build_body_parts():
                               rotation=(0, 0, math.radians(10)), vertices=6))
     bevel_object(parts[-1], 0.005)
 
-    for p in parts:
-        apply_modifiers(p)
     groups["Spine"] = join_objects(parts, "Grp_Spine")
 
     # ── HEAD (elderly face with long gray beard + pointed wizard hat) ──
@@ -283,8 +445,6 @@ def build_body_parts():
                           (0.13, 0.13, 0.025), MAT_ROBE_DK))
     bevel_object(parts[-1], 0.005)
 
-    for p in parts:
-        apply_modifiers(p)
     groups["Head"] = join_objects(parts, "Grp_Head")
 
     # ── LEFT UPPER ARM (wide purple robe sleeve) ──
@@ -296,8 +456,6 @@ def build_body_parts():
     parts.append(add_cube("SleeveCuffL", (-0.15, 0, z(0.34)),
                           (0.11, 0.11, 0.04), MAT_ROBE_DK))
     bevel_object(parts[-1], 0.01)
-    for p in parts:
-        apply_modifiers(p)
     groups["L_UpperArm"] = join_objects(parts, "Grp_L_UpperArm")
 
     # ── LEFT FOREARM (robe sleeve + hand visible) ──
@@ -305,16 +463,13 @@ def build_body_parts():
     parts.append(add_cube("ArmLL", (-0.16, -0.02, z(0.28)),
                           (0.08, 0.08, 0.10), MAT_ROBE))
     bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
     groups["L_ForeArm"] = join_objects(parts, "Grp_L_ForeArm")
 
     # ── LEFT HAND ──
     p = add_cube("HandL", (-0.16, -0.03, z(0.22)),
                   (0.06, 0.06, 0.05), MAT_SKIN_DK)
     bevel_object(p, 0.02)
-    apply_modifiers(p)
-    groups["L_Hand"] = p
+    groups["L_Hand"] = own_mesh(p)
 
     # ── RIGHT UPPER ARM (wide purple robe sleeve) ──
     parts = []
@@ -325,8 +480,6 @@ def build_body_parts():
     parts.append(add_cube("SleeveCuffR", (0.15, 0, z(0.34)),
                           (0.11, 0.11, 0.04), MAT_ROBE_DK))
     bevel_object(parts[-1], 0.01)
-    for p in parts:
-        apply_modifiers(p)
     groups["R_UpperArm"] = join_objects(parts, "Grp_R_UpperArm")
 
     # ── RIGHT FOREARM (robe sleeve) ──
@@ -334,8 +487,6 @@ def build_body_parts():
     parts.append(add_cube("ArmRL", (0.16, -0.02, z(0.28)),
                           (0.08, 0.08, 0.10), MAT_ROBE))
     bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
     groups["R_ForeArm"] = join_objects(parts, "Grp_R_ForeArm")
 
     # ── RIGHT HAND + STAFF ──
@@ -373,16 +524,13 @@ def build_body_parts():
                               (0.012, 0.012, 0.03), MAT_METAL,
                               rotation=(math.radians(90), 0, 0), vertices=6))
 
-    for p in parts:
-        apply_modifiers(p)
     groups["R_Hand"] = join_objects(parts, "Grp_R_Hand")
 
     # ── LEFT UPPER LEG (covered by robe skirt) ──
     p = add_cube("LegLU", (-0.07, 0, z(0.12)),
                  (0.09, 0.10, 0.12), MAT_ROBE_DK)
     bevel_object(p, 0.02)
-    apply_modifiers(p)
-    groups["L_UpperLeg"] = p
+    groups["L_UpperLeg"] = own_mesh(p)
 
     # ── LEFT LOWER LEG + soft shoe ──
     parts = []
@@ -393,16 +541,13 @@ def build_body_parts():
     parts.append(add_cube("ShoeL", (-0.07, -0.02, z(-0.04)),
                           (0.08, 0.12, 0.05), MAT_SHOES))
     bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
     groups["L_LowerLeg"] = join_objects(parts, "Grp_L_LowerLeg")
 
     # ── RIGHT UPPER LEG ──
     p = add_cube("LegRU", (0.07, 0, z(0.12)),
                  (0.09, 0.10, 0.12), MAT_ROBE_DK)
     bevel_object(p, 0.02)
-    apply_modifiers(p)
-    groups["R_UpperLeg"] = p
+    groups["R_UpperLeg"] = own_mesh(p)
 
     # ── RIGHT LOWER LEG + soft shoe ──
     parts = []
@@ -412,10 +557,20 @@ def build_body_parts():
     parts.append(add_cube("ShoeR", (0.07, -0.02, z(-0.04)),
                           (0.08, 0.12, 0.05), MAT_SHOES))
     bevel_object(parts[-1], 0.02)
-    for p in parts:
-        apply_modifiers(p)
     groups["R_LowerLeg"] = join_objects(parts, "Grp_R_LowerLeg")
 
+    # Parts are built unlinked; hand the finished groups to the scene in
+    # one go
+    for obj in groups.values():
+        bpy.context.collection.objects.link(obj)
+    # The cached part meshes were only read by join_objects/own_mesh; free
+    # them so they aren't saved as orphans
+    in_use = {obj.data for obj in groups.values()}
+    bpy.data.batch_remove(ids=[me for me in {*_MESH_CACHE.values(), *_BEVEL_CACHE.values()}
+                               if me not in in_use])
+    _MESH_CACHE.clear()
+    _BEVEL_CACHE.clear()
+
     return groups
 
 
@@ -428,14 +583,16 @@ def create_armature():
     Includes R_Hand/L_Hand bones for hand-posing."""
     z = Z_OFF
 
-    bpy.ops.object.armature_add(enter_editmode=True, location=(0, 0, 0))
-    arm_obj = bpy.context.active_object
-    arm_obj.name = "WizardArmature"
-    arm = arm_obj.data
-    arm.name = "WizardRig"
-
-    for b in arm.edit_bones:
-        arm.edit_bones.remove(b)
+    # Built through bpy.data so there's no default "Bone" to delete; the
+    # override hands mode_set the armature without touching the selection
+    # or the view layer's active object
+    arm = bpy.data.armatures.new("WizardRig")
+    arm_obj = bpy.data.objects.new("WizardArmature", arm)
+    bpy.context.collection.objects.link(arm_obj)
+    override = dict(active_object=arm_obj, object=arm_obj,
+                    selected_objects=[arm_obj])
+    with bpy.context.temp_override(**override):
+        bpy.ops.object.mode_set(mode='EDIT')
 
     def add_bone(name, head, tail, parent_name=None, connect=False):
         b = arm.edit_bones.new(name)
@@ -473,7 +630,8 @@ def create_armature():
     add_bone("R_UpperLeg", (0.07, 0, z+0.18), (0.07, 0, z+0.06), "Root")
     add_bone("R_LowerLeg", (0.07, 0, z+0.06), (0.07, 0, z-0.05), "R_UpperLeg", connect=True)
 
-    bpy.ops.object.mode_set(mode='OBJECT')
+    with bpy.context.temp_override(**override):
+        bpy.ops.object.mode_set(mode='OBJECT')
     return arm_obj
 
 
@@ -490,214 +648,186 @@ def rig_model(arm_obj, all_groups):
 #  Animations
 # ──────────────────────────────────────────────
 
-def set_bone_rot(pose_bone, x_deg, y_deg, z_deg):
-    pose_bone.rotation_mode = 'XYZ'
-    pose_bone.rotation_euler = (
-        math.radians(x_deg),
-        math.radians(y_deg),
-        math.radians(z_deg)
-    )
-
-def set_bone_loc(pose_bone, x, y, z_val):
-    pose_bone.location = (x, y, z_val)
-
-def key_all_bones(arm_obj, frame):
-    for pb in arm_obj.pose.bones:
-        pb.keyframe_insert(data_path="rotation_euler", frame=frame)
-        pb.keyframe_insert(data_path="location", frame=frame)
-
-def reset_pose(arm_obj):
-    for pb in arm_obj.pose.bones:
-        pb.rotation_mode = 'XYZ'
-        pb.rotation_euler = (0, 0, 0)
-        pb.location = (0, 0, 0)
-
-
-def create_walk_cycle(arm_obj):
+def bake_poses(bone_names, poses):
+    """Turn (frame, {bone: rotation degrees}, {bone: location}) rows into
+    frames plus a (frames, bones, 6) table for write_fcurves.  Bones a row
+    doesn't mention stay at rest, with no pose reset between keys."""
+    bone_index = {name: i for i, name in enumerate(bone_names)}
+    frames = np.array([frame for frame, _rots, _locs in poses], dtype=np.float32)
+    values = np.zeros((len(poses), len(bone_names), 6), dtype=np.float32)
+    for row, (_frame, rots, locs) in enumerate(poses):
+        for bone, rot in rots.items():
+            values[row, bone_index[bone], :3] = rot
+        for bone, loc in locs.items():
+            values[row, bone_index[bone], 3:] = loc
+    # Every rotation to radians in one vectorized call
+    values[:, :, :3] = np.radians(values[:, :, :3])
+    return frames, values
+
+# Keyframe interpolation enum items, for writing interpolation as ints
+_INTERPOLATION = bpy.types.Keyframe.bl_rna.properties["interpolation"].enum_items
+
+def write_fcurves(action, bone_names, frames, values, interpolation):
+    """Write a baked pose table into action in one pass.  values is
+    (n_frames, n_bones, 6) — rotation XYZ (radians) then location XYZ per
+    bone; each bone channel gets one fcurve filled with a single
+    foreach_set straight from its column instead of a keyframe_insert per
+    bone per frame.  keyframe_points.add already creates BEZIER keys, so
+    interpolation is only written otherwise."""
+    interp = None
+    if interpolation != 'BEZIER':
+        interp = [_INTERPOLATION[interpolation].value] * len(frames)
+    co = np.empty(len(frames) * 2, dtype=np.float32)
+    co[0::2] = frames
+    for b, name in enumerate(bone_names):
+        for c, prop in enumerate(("rotation_euler", "location")):
+            data_path = f'pose.bones["{name}"].{prop}'
+            for axis in range(3):
+                fc = action.fcurves.new(data_path, index=axis, action_group=name)
+                fc.keyframe_points.add(len(frames))
+                co[1::2] = values[:, b, c * 3 + axis]
+                fc.keyframe_points.foreach_set("co", co)
+                if interp is not None:
+                    fc.keyframe_points.foreach_set("interpolation", interp)
+                fc.update()
+
+
+def _walk_poses(swing=25, l_swing=20, bob=0.015):
     """Walk with staff held upright (+Z) in right hand.
     R_ForeArm X=-90° holds forearm horizontal, staff vertical.
-    Left arm swings normally. Slower, stately pace."""
-    action = bpy.data.actions.new("Walk")
-    arm_obj.animation_data_create()
-    arm_obj.animation_data.action = action
-
-    pb = arm_obj.pose.bones
-    swing = 25    # leg swing angle (slower than pikeman)
-    l_swing = 20  # left arm swing
-    bob = 0.015
-
-    # Frame 1: neutral — staff upright in right hand
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_ForeArm"], -90, 0, 0)   # forearm horizontal, staff +Z
-    key_all_bones(arm_obj, 1)
-
-    # Frame 7: left leg forward, right leg back
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_ForeArm"], -90, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"],  swing, 0, 0)
-    set_bone_rot(pb["L_LowerLeg"], -swing*0.3, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"], -swing, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],  l_swing, 0, 0)
-    set_bone_rot(pb["L_ForeArm"],  -l_swing*0.4, 0, 0)
-    set_bone_loc(pb["Root"], 0, 0, bob)
-    set_bone_rot(pb["Spine"], 0, 0, 2)
-    key_all_bones(arm_obj, 7)
-
-    # Frame 13: neutral
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_ForeArm"], -90, 0, 0)
-    key_all_bones(arm_obj, 13)
-
-    # Frame 19: mirror — right leg forward, left leg back
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_ForeArm"], -90, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"],  swing, 0, 0)
-    set_bone_rot(pb["R_LowerLeg"], -swing*0.3, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"], -swing, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -l_swing, 0, 0)
-    set_bone_loc(pb["Root"], 0, 0, bob)
-    set_bone_rot(pb["Spine"], 0, 0, -2)
-    key_all_bones(arm_obj, 19)
-
-    # Frame 25: loop back to neutral
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_ForeArm"], -90, 0, 0)
-    key_all_bones(arm_obj, 25)
-
-    for fc in action.fcurves:
-        for kp in fc.keyframe_points:
-            kp.interpolation = 'LINEAR'
-
-    action.use_fake_user = True
-    print("  Walk cycle created (frames 1-25, loop)")
-    return action
-
-
-def create_attack_anim(arm_obj):
-    """Spell casting — PLACEHOLDER for hand-posing.
-    Poses will be captured via read_pose.py and filled in here.
-    Keyframes: 1 (rest), 6 (cast), 11 (channel), 16 (release), 20 (rest).
-    """
-    action = bpy.data.actions.new("Attack")
-    arm_obj.animation_data.action = action
-
-    pb = arm_obj.pose.bones
-
+    Left arm swings normally. Slower, stately pace (swing is the leg
+    swing angle, slower than pikeman; l_swing the left arm swing)."""
+    staff = {"R_ForeArm": (-90, 0, 0)}   # forearm horizontal, staff +Z
+    bob_loc = {"Root": (0, 0, bob)}
+    return [
+        # Frame 1: neutral — staff upright in right hand
+        (1, staff, {}),
+        # Frame 7: left leg forward, right leg back
+        (7, {**staff,
+             "L_UpperLeg": ( swing,         0, 0),
+             "L_LowerLeg": (-swing * 0.3,   0, 0),
+             "R_UpperLeg": (-swing,         0, 0),
+             "L_UpperArm": ( l_swing,       0, 0),
+             "L_ForeArm":  (-l_swing * 0.4, 0, 0),
+             "Spine":      (0, 0, 2)}, bob_loc),
+        # Frame 13: neutral
+        (13, staff, {}),
+        # Frame 19: mirror — right leg forward, left leg back
+        (19, {**staff,
+              "R_UpperLeg": ( swing,       0, 0),
+              "R_LowerLeg": (-swing * 0.3, 0, 0),
+              "L_UpperLeg": (-swing,       0, 0),
+              "L_UpperArm": (-l_swing,     0, 0),
+              "Spine":      (0, 0, -2)}, bob_loc),
+        # Frame 25: loop back to neutral
+        (25, staff, {}),
+    ]
+
+
+# Each clip is (frame, {bone: rotation degrees}, {bone: location}) rows for
+# bake_poses; bones a row leaves out are at rest.
+WALK_POSES = _walk_poses()
+
+# Spell casting — PLACEHOLDER for hand-posing.  Poses will be captured via
+# read_pose.py and filled in here.
+# Keyframes: 1 (rest), 6 (cast), 11 (channel), 16 (release), 20 (rest).
+ATTACK_POSES = [
     # Frame 1: rest — staff upright in right hand (same as walk neutral)
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_ForeArm"], -90, 0, 0)
-    key_all_bones(arm_obj, 1)
-
+    (1, {"R_ForeArm": (-90, 0, 0)}, {}),
     # Frame 6: raise staff — both arms rise, staff thrust forward
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_UpperArm"], 0, 0, -30)
-    set_bone_rot(pb["R_ForeArm"], -75, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -20, 30, 20)
-    set_bone_rot(pb["L_ForeArm"], -30, 0, 0)
-    set_bone_rot(pb["Spine"], -5, 0, 0)
-    key_all_bones(arm_obj, 6)
-
+    (6, {"R_UpperArm": (0, 0, -30),
+         "R_ForeArm":  (-75, 0, 0),
+         "L_UpperArm": (-20, 30, 20),
+         "L_ForeArm":  (-30, 0, 0),
+         "Spine":      (-5, 0, 0)}, {}),
     # Frame 11: channel — staff extended, leaning into cast
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_UpperArm"], 0, 0, -45)
-    set_bone_rot(pb["R_ForeArm"], -60, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -30, 35, 25)
-    set_bone_rot(pb["L_ForeArm"], -40, 0, 0)
-    set_bone_rot(pb["Spine"], -8, 0, 0)
-    set_bone_rot(pb["Head"], 5, 0, 0)
-    key_all_bones(arm_obj, 11)
-
+    (11, {"R_UpperArm": (0, 0, -45),
+          "R_ForeArm":  (-60, 0, 0),
+          "L_UpperArm": (-30, 35, 25),
+          "L_ForeArm":  (-40, 0, 0),
+          "Spine":      (-8, 0, 0),
+          "Head":       (5, 0, 0)}, {}),
     # Frame 16: release — recoil from spell launch
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_UpperArm"], 5, 0, -20)
-    set_bone_rot(pb["R_ForeArm"], -80, 0, 0)
-    set_bone_rot(pb["L_UpperArm"], -10, 15, 10)
-    set_bone_rot(pb["L_ForeArm"], -15, 0, 0)
-    set_bone_rot(pb["Spine"], 3, 0, 0)
-    key_all_bones(arm_obj, 16)
-
+    (16, {"R_UpperArm": (5, 0, -20),
+          "R_ForeArm":  (-80, 0, 0),
+          "L_UpperArm": (-10, 15, 10),
+          "L_ForeArm":  (-15, 0, 0),
+          "Spine":      (3, 0, 0)}, {}),
     # Frame 20: recover to rest
-    reset_pose(arm_obj)
-    set_bone_rot(pb["R_ForeArm"], -90, 0, 0)
-    key_all_bones(arm_obj, 20)
-
-    for fc in action.fcurves:
-        for kp in fc.keyframe_points:
-            kp.interpolation = 'BEZIER'
-
-    action.use_fake_user = True
-    print("  Attack (spell cast) PLACEHOLDER created (frames 1-20)")
-    return action
-
-
-def create_die_anim(arm_obj):
-    """Stagger and topple backward — same template as Pikeman."""
-    action = bpy.data.actions.new("Die")
-    arm_obj.animation_data.action = action
-
-    pb = arm_obj.pose.bones
+    (20, {"R_ForeArm": (-90, 0, 0)}, {}),
+]
 
+# Stagger and topple backward — same template as Pikeman.
+DIE_POSES = [
     # Frame 1: alive
-    reset_pose(arm_obj)
-    key_all_bones(arm_obj, 1)
-
+    (1, {}, {}),
     # Frame 6: hit stagger
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],       15, 0, 0)
-    set_bone_rot(pb["Head"],        10, 0, 5)
-    set_bone_rot(pb["R_UpperArm"],  10, 0, 20)
-    set_bone_rot(pb["L_UpperArm"],  10, 0, -20)
-    set_bone_loc(pb["Root"], 0, -0.02, 0)
-    key_all_bones(arm_obj, 6)
-
+    (6, {"Spine":      (15, 0, 0),
+         "Head":       (10, 0, 5),
+         "R_UpperArm": (10, 0, 20),
+         "L_UpperArm": (10, 0, -20)},
+        {"Root": (0, -0.02, 0)}),
     # Frame 12: recoil backward
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],       -20, 0, 3)
-    set_bone_rot(pb["Head"],        -15, 0, -5)
-    set_bone_rot(pb["R_UpperArm"],  -20, 0, 30)
-    set_bone_rot(pb["R_ForeArm"],   -20, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],  -20, 0, -30)
-    set_bone_rot(pb["L_ForeArm"],   -20, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"],  -20, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"],  -20, 0, 0)
-    set_bone_loc(pb["Root"], 0, -0.05, 0.05)
-    key_all_bones(arm_obj, 12)
-
+    (12, {"Spine":      (-20, 0, 3),
+          "Head":       (-15, 0, -5),
+          "R_UpperArm": (-20, 0, 30),
+          "R_ForeArm":  (-20, 0, 0),
+          "L_UpperArm": (-20, 0, -30),
+          "L_ForeArm":  (-20, 0, 0),
+          "L_UpperLeg": (-20, 0, 0),
+          "R_UpperLeg": (-20, 0, 0)},
+         {"Root": (0, -0.05, 0.05)}),
     # Frame 20: falling backward
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],       -50, 0, 5)
-    set_bone_rot(pb["Head"],        -30, 0, -10)
-    set_bone_rot(pb["R_UpperArm"],  -40, 0, 45)
-    set_bone_rot(pb["R_ForeArm"],   -30, 0, 0)
-    set_bone_rot(pb["L_UpperArm"],  -40, 0, -45)
-    set_bone_rot(pb["L_ForeArm"],   -30, 0, 0)
-    set_bone_rot(pb["L_UpperLeg"],  -50, 0, 0)
-    set_bone_rot(pb["R_UpperLeg"],  -50, 0, 0)
-    set_bone_loc(pb["Root"], 0, -0.20, 0.15)
-    key_all_bones(arm_obj, 20)
-
+    (20, {"Spine":      (-50, 0, 5),
+          "Head":       (-30, 0, -10),
+          "R_UpperArm": (-40, 0, 45),
+          "R_ForeArm":  (-30, 0, 0),
+          "L_UpperArm": (-40, 0, -45),
+          "L_ForeArm":  (-30, 0, 0),
+          "L_UpperLeg": (-50, 0, 0),
+          "R_UpperLeg": (-50, 0, 0)},
+         {"Root": (0, -0.20, 0.15)}),
     # Frame 30: on the ground
-    reset_pose(arm_obj)
-    set_bone_rot(pb["Spine"],       -80.0, 0.0, 5.0)
-    set_bone_rot(pb["Head"],        -40.0, 0.0, -15.0)
-    set_bone_rot(pb["L_UpperArm"],  161.5, -21.8, -92.9)
-    set_bone_rot(pb["L_ForeArm"],   -10.0, 0.0, -20.0)
-    set_bone_rot(pb["R_UpperArm"],  69.1, -41.8, -46.0)
-    set_bone_rot(pb["R_ForeArm"],   -10.0, 0.0, 20.0)
-    set_bone_rot(pb["L_UpperLeg"],  -67.7, 30.3, 23.3)
-    set_bone_rot(pb["L_LowerLeg"],  10.0, 0.0, 0.0)
-    set_bone_rot(pb["R_UpperLeg"],  -74.0, -16.0, -20.8)
-    set_bone_rot(pb["R_LowerLeg"],  10.0, 0.0, 0.0)
-    set_bone_loc(pb["Root"], 0, -0.35, 0.30)
-    key_all_bones(arm_obj, 30)
-
-    for fc in action.fcurves:
-        for kp in fc.keyframe_points:
-            kp.interpolation = 'BEZIER'
-
-    action.use_fake_user = True
-    print("  Die animation created (frames 1-30)")
-    return action
+    (30, {"Spine":      (-80.0, 0.0, 5.0),
+          "Head":       (-40.0, 0.0, -15.0),
+          "L_UpperArm": (161.5, -21.8, -92.9),
+          "L_ForeArm":  (-10.0, 0.0, -20.0),
+          "R_UpperArm": (69.1, -41.8, -46.0),
+          "R_ForeArm":  (-10.0, 0.0, 20.0),
+          "L_UpperLeg": (-67.7, 30.3, 23.3),
+          "L_LowerLeg": (10.0, 0.0, 0.0),
+          "R_UpperLeg": (-74.0, -16.0, -20.8),
+          "R_LowerLeg": (10.0, 0.0, 0.0)},
+         {"Root": (0, -0.35, 0.30)}),
+]
+
+
+# (action name, poses, interpolation, log line); one loop builds them all
+ANIMATIONS = [
+    ("Walk",   WALK_POSES,   'LINEAR', "Walk cycle created (frames 1-25, loop)"),
+    ("Attack", ATTACK_POSES, 'BEZIER', "Attack (spell cast) PLACEHOLDER created (frames 1-20)"),
+    ("Die",    DIE_POSES,    'BEZIER', "Die animation created (frames 1-30)"),
+]
+
+
+def build_all_animations(arm_obj):
+    """Bake and write every clip in ANIMATIONS as a fake-user action.
+    Returns the actions in ANIMATIONS order."""
+    arm_obj.animation_data_create()
+    bone_names = [pb.name for pb in arm_obj.pose.bones]
+    for pb in arm_obj.pose.bones:
+        pb.rotation_mode = 'XYZ'
+
+    actions = []
+    for action_name, poses, interpolation, log_line in ANIMATIONS:
+        action = bpy.data.actions.new(action_name)
+        arm_obj.animation_data.action = action
+        write_fcurves(action, bone_names, *bake_poses(bone_names, poses),
+                      interpolation)
+        action.use_fake_user = True
+        actions.append(action)
+        print(f"  {log_line}")
+    return actions
 
 
 # ──────────────────────────────────────────────
@@ -717,14 +847,9 @@ def main():
     # Rig everything
     rig_model(arm_obj, all_groups)
 
-    # Switch to pose mode
-    bpy.context.view_layer.objects.active = arm_obj
-    bpy.ops.object.mode_set(mode='POSE')
-
-    # Create animations
-    walk_action   = create_walk_cycle(arm_obj)
-    attack_action = create_attack_anim(arm_obj)
-    die_action    = create_die_anim(arm_obj)
+    # Create animations — keys go straight into fcurves from the pose
+    # tables, so no Pose Mode is needed for this
+    walk_action, attack_action, die_action = build_all_animations(arm_obj)
 
     # Push to NLA tracks
     anim_data = arm_obj.animation_data
@@ -735,38 +860,39 @@ def main():
         strip.name = action.name
         track.mute = True
 
-    # Leave Attack active for posing
-    anim_data.action = attack_action
-    bpy.context.scene.frame_set(1)
-
-    # Exit pose mode for lights/camera
-    bpy.ops.object.mode_set(mode='OBJECT')
+    # Lighting and camera through bpy.data — no operator, undo push or
+    # selection change per object
+    key_light = bpy.data.objects.new(
+        "KeyLight", bpy.data.lights.new("KeyLight", type='SUN'))
+    key_light.location = (3, -3, 5)
+    key_light.data.energy = 3.0
 
-    # Lighting
-    bpy.ops.object.light_add(type='SUN', location=(3, -3, 5))
-    bpy.context.active_object.name = "KeyLight"
-    bpy.context.active_object.data.energy = 3.0
+    fill_light = bpy.data.objects.new(
+        "FillLight", bpy.data.lights.new("FillLight", type='AREA'))
+    fill_light.location = (-2, 2, 3)
+    fill_light.data.energy = 50.0
+    fill_light.data.size = 3.0
 
-    bpy.ops.object.light_add(type='AREA', location=(-2, 2, 3))
-    bpy.context.active_object.name = "FillLight"
-    bpy.context.active_object.data.energy = 50.0
-    bpy.context.active_object.data.size = 3.0
+    camera = bpy.data.objects.new(
+        "WizardCamera", bpy.data.cameras.new("WizardCamera"))
+    camera.location = (1.2, -2.0, 0.5)
+    camera.rotation_euler = (math.radians(78), 0, math.radians(25))
 
-    # Camera
-    bpy.ops.object.camera_add(location=(1.2, -2.0, 0.5),
-                               rotation=(math.radians(78), 0, math.radians(25)))
-    bpy.context.active_object.name = "WizardCamera"
-    bpy.context.scene.camera = bpy.context.active_object
+    for obj in (key_light, fill_light, camera):
+        bpy.context.collection.objects.link(obj)
+    bpy.context.scene.camera = camera
 
     bpy.context.scene.frame_start = 1
     bpy.context.scene.frame_end = 30
     bpy.context.scene.render.fps = 24
 
-    # Re-enter Pose Mode for posing
+    # Select the armature; in the UI also enter Pose Mode for posing.
+    # Background (CLI) runs have no screen and skip the mode switch.
     bpy.ops.object.select_all(action='DESELECT')
     arm_obj.select_set(True)
     bpy.context.view_layer.objects.active = arm_obj
-    bpy.ops.object.mode_set(mode='POSE')
+    if bpy.context.screen:
+        bpy.ops.object.mode_set(mode='POSE')
 
     # Set Attack as active action at frame 1 for posing
     anim_data.action = attack_action
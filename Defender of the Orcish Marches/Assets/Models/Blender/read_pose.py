@@ -11,7 +11,7 @@ Usage:
 """
 
 import bpy
-import math
+import numpy as np
 
 ROT_THRESHOLD = 0.5   # degrees
 LOC_THRESHOLD = 0.001  # units
@@ -20,10 +20,8 @@ LOC_THRESHOLD = 0.001  # units
 def read_current_pose():
     arm_obj = bpy.context.active_object
     if arm_obj is None or arm_obj.type != 'ARMATURE':
-        for obj in bpy.data.objects:
-            if obj.type == 'ARMATURE':
-                arm_obj = obj
-                break
+        arm_obj = next((obj for obj in bpy.data.objects
+                        if obj.type == 'ARMATURE'), None)
 
     if arm_obj is None or arm_obj.type != 'ARMATURE':
         print("ERROR: No armature found!")
@@ -31,48 +29,54 @@ def read_current_pose():
 
     frame = bpy.context.scene.frame_current
 
-    print("=" * 60)
-    print(f"  Pose bone transforms at frame {frame}")
-    print(f"  Armature: {arm_obj.name}")
-    print("=" * 60)
+    # Everything is collected here and printed in one write at the end —
+    # each print is a separate console write, which is slow on Windows
+    out_lines = [
+        "=" * 60,
+        f"  Pose bone transforms at frame {frame}",
+        f"  Armature: {arm_obj.name}",
+        "=" * 60,
+    ]
 
     code_lines = []
     code_lines.append(f"    # Frame {frame}:")
 
-    for pb in arm_obj.pose.bones:
-        rx = math.degrees(pb.rotation_euler.x)
-        ry = math.degrees(pb.rotation_euler.y)
-        rz = math.degrees(pb.rotation_euler.z)
-        lx, ly, lz = pb.location.x, pb.location.y, pb.location.z
-
-        has_rot = (abs(rx) > ROT_THRESHOLD or
-                   abs(ry) > ROT_THRESHOLD or
-                   abs(rz) > ROT_THRESHOLD)
-        has_loc = (abs(lx) > LOC_THRESHOLD or
-                   abs(ly) > LOC_THRESHOLD or
-                   abs(lz) > LOC_THRESHOLD)
+    # All rotations and locations in one foreach_get each, straight into
+    # float32 buffers (the native type, so a plain copy), then converted
+    # and thresholded in numpy instead of six reads per bone
+    bones = arm_obj.pose.bones
+    rots = np.empty(len(bones) * 3, dtype=np.float32)
+    locs = np.empty(len(bones) * 3, dtype=np.float32)
+    bones.foreach_get("rotation_euler", rots)
+    bones.foreach_get("location", locs)
+    rots = np.degrees(rots).reshape(-1, 3)
+    locs = locs.reshape(-1, 3)
+    rot_mask = (np.abs(rots) > ROT_THRESHOLD).any(axis=1)
+    loc_mask = (np.abs(locs) > LOC_THRESHOLD).any(axis=1)
 
+    for pb, (rx, ry, rz), (lx, ly, lz), has_rot, has_loc in zip(
+            bones, rots, locs, rot_mask, loc_mask):
         if has_rot or has_loc:
-            print(f"  {pb.name}:")
+            out_lines.append(f"  {pb.name}:")
         if has_rot:
-            print(f"    rot=({rx:.1f}, {ry:.1f}, {rz:.1f})")
+            out_lines.append(f"    rot=({rx:.1f}, {ry:.1f}, {rz:.1f})")
             code_lines.append(
                 f'    set_bone_rot(pb["{pb.name}"], {rx:.1f}, {ry:.1f}, {rz:.1f})'
             )
         if has_loc:
-            print(f"    loc=({lx:.4f}, {ly:.4f}, {lz:.4f})")
+            out_lines.append(f"    loc=({lx:.4f}, {ly:.4f}, {lz:.4f})")
             code_lines.append(
                 f'    set_bone_loc(pb["{pb.name}"], {lx:.4f}, {ly:.4f}, {lz:.4f})'
             )
 
-    print("=" * 60)
-    print("")
-    print("  Copy-paste code for generate_pikeman.py:")
-    print("  " + "-" * 40)
-    for line in code_lines:
-        print(line)
-    print("  " + "-" * 40)
-    print("")
+    out_lines += ["=" * 60,
+                  "",
+                  "  Copy-paste code for generate_pikeman.py:",
+                  "  " + "-" * 40,
+                  *code_lines,
+                  "  " + "-" * 40,
+                  ""]
+    print("\n".join(out_lines))
 
 
 if __name__ == "__main__":
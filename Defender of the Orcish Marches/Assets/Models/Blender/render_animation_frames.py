@@ -9,6 +9,7 @@ Usage:
   3. Images are saved to the Model_Preview folder
 
 Output files are named:  orc_{action_name}_frame_{NN}.png
+(or orc_{action_name}_{start}-{end}.mp4 with OUTPUT_VIDEO)
 Any existing files with the same names are overwritten.
 """
 
@@ -23,6 +24,8 @@ OUTPUT_DIR = r"C:\Users\chris\source\repos\Orc\Model_Preview"
 FRAME_STEP = 5          # render every N frames
 RESOLUTION_X = 960
 RESOLUTION_Y = 540
+USE_OPENGL = True       # viewport (solid) capture; False for full EEVEE renders
+OUTPUT_VIDEO = False    # one H.264 MP4 of every frame instead of stepped PNGs
 
 # ──────────────────────────────────────────────
 #  Detect which animation is active
@@ -30,11 +33,8 @@ RESOLUTION_Y = 540
 
 def get_active_animation_name():
     """Return the name of the current action or soloed NLA track."""
-    arm = None
-    for obj in bpy.data.objects:
-        if obj.type == 'ARMATURE' and obj.animation_data:
-            arm = obj
-            break
+    arm = next((obj for obj in bpy.data.objects
+                if obj.type == 'ARMATURE' and obj.animation_data), None)
 
     if arm is None:
         print("ERROR: No armature with animation data found.")
@@ -91,9 +91,21 @@ def render_frames():
     scene.render.resolution_percentage = 100
     scene.render.image_settings.file_format = 'PNG'
 
-    # Use viewport shading for speed (solid mode render)
-    # If you want full rendered images, comment out the next 2 lines
-    scene.render.engine = 'BLENDER_EEVEE_NEXT'
+    # Viewport capture skips EEVEE's shader compile, shadows and TAA,
+    # which is all a preview needs; USE_OPENGL = False for full renders
+    if USE_OPENGL:
+        scene.display.shading.type = 'SOLID'
+        render = bpy.ops.render.opengl
+        view = dict(view_context=False)
+    else:
+        scene.render.engine = 'BLENDER_EEVEE_NEXT'
+        render = bpy.ops.render.render
+        view = {}
+
+    if OUTPUT_VIDEO:
+        render_video(scene, anim_name, safe_name, frame_start, frame_end,
+                     render, view)
+        return
 
     # Build list of frames to render
     frames = list(range(frame_start, frame_end + 1, FRAME_STEP))
@@ -106,17 +118,67 @@ def render_frames():
     print(f"Output: {OUTPUT_DIR}")
     print("-" * 40)
 
-    for frame in frames:
-        scene.frame_set(frame)
-        filename = f"orc_{safe_name}_frame_{frame:02d}.png"
-        filepath = os.path.join(OUTPUT_DIR, filename)
-        scene.render.filepath = filepath
-        bpy.ops.render.render(write_still=True)
-        print(f"  ✓ Frame {frame:02d} → {filename}")
+    # One stepped animation render instead of a frame_set + render per
+    # frame; "##" makes Blender write the same two-digit frame names
+    saved = (scene.frame_start, scene.frame_end, scene.frame_step,
+             scene.render.filepath)
+    scene.frame_start = frame_start
+    scene.frame_end = frame_end
+    scene.frame_step = FRAME_STEP
+    base = os.path.join(OUTPUT_DIR, f"orc_{safe_name}_frame_")
+    scene.render.filepath = base + "##"
+    scene.render.use_file_extension = True
+    # Put the user's range, step and output path back even if a render fails
+    try:
+        render(animation=True, **view)
+
+        # The step can skip the last frame — render that one on its own
+        if (frame_end - frame_start) % FRAME_STEP:
+            scene.frame_set(frame_end)
+            scene.render.filepath = f"{base}{frame_end:02d}.png"
+            render(write_still=True, **view)
+    finally:
+        (scene.frame_start, scene.frame_end, scene.frame_step,
+         scene.render.filepath) = saved
+
+    prefix = f"orc_{safe_name}_frame_"
+    print("\n".join(f"  ✓ Frame {frame:02d} → {prefix}{frame:02d}.png"
+                    for frame in frames))
 
     print("-" * 40)
     print(f"Done! {len(frames)} frames rendered to {OUTPUT_DIR}")
 
 
+def render_video(scene, anim_name, safe_name, frame_start, frame_end,
+                 render, view):
+    """Encode the whole clip straight to MP4 through Blender's built-in
+    FFmpeg output — no PNG written or read back per frame."""
+    scene.render.image_settings.file_format = 'FFMPEG'
+    scene.render.ffmpeg.format = 'MPEG4'
+    scene.render.ffmpeg.codec = 'H264'
+
+    print(f"Rendering '{anim_name}' — frames {frame_start}–{frame_end} to video")
+    print(f"Output: {OUTPUT_DIR}")
+    print("-" * 40)
+
+    saved = (scene.frame_start, scene.frame_end, scene.frame_step,
+             scene.render.filepath)
+    scene.frame_start = frame_start
+    scene.frame_end = frame_end
+    scene.frame_step = 1
+    # Blender appends the frame range and .mp4
+    scene.render.filepath = os.path.join(OUTPUT_DIR, f"orc_{safe_name}_")
+    scene.render.use_file_extension = True
+    try:
+        render(animation=True, **view)
+    finally:
+        (scene.frame_start, scene.frame_end, scene.frame_step,
+         scene.render.filepath) = saved
+
+    print("-" * 40)
+    print(f"Done! orc_{safe_name}_{frame_start:04d}-{frame_end:04d}.mp4 "
+          f"written to {OUTPUT_DIR}")
+
+
 if __name__ == "__main__":
     render_frames()